@@ -1,6 +1,37 @@
+import os
+import threading
+
 from django.apps import AppConfig
 
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+
+# PUBLIC_INTERFACE
+def start_background_tasks():
+    """
+    Start the background Neo4j work of a serving process:
+    - the health monitor behind /api/health/neo4j/, every NEO4J_HEALTH_INTERVAL seconds
+      (0 disables it; the view then probes on request);
+    - a one-off warm-up that opens the connection and pre-plans every NLP template, so the
+      first API request does not pay for the handshake and cold query planning
+      (disabled by NEO4J_WARMUP=false).
+
+    Called from the ASGI entrypoint (config.asgi) only, so management commands, the test runner
+    and runserver never start them; in particular warm-up can't race seed_graph's transaction.
+    Skipped when Neo4j is not configured.
+    """
+    if not os.getenv("NEO4J_URI"):
+        return
+
+    from .neo4j_service import env_number, neo4j_service
+    from .services import qa_service
+
+    interval = env_number("NEO4J_HEALTH_INTERVAL", 5.0)
+    if interval > 0:
+        neo4j_service.start_health_monitor(interval)
+
+    if os.getenv("NEO4J_WARMUP", "true").strip().lower() in ("1", "true", "yes", "on"):
+        threading.Thread(target=qa_service.warm_up, name="neo4j-warmup", daemon=True).start()
@@ -1,140 +1,247 @@
 from django.core.management.base import BaseCommand
 from api.neo4j_service import neo4j_service
 
+# Labels owned by this seed; existing nodes carrying any of them are wiped before re-seeding.
+SEED_LABELS = [
+    "Person",
+    "Organization",
+    "Team",
+    "Country",
+    "City",
+    "Record",
+    "Trophy",
+    "Format",
+    "Role",
+]
+
+# Node lookup indexes: (label, property). Every NLP template starts from a Person, the generic rules
+# look Organizations up by name, the Record templates filter on type, and the seed itself matches
+# relationship endpoints by name.
+INDEXES = [
+    ("Person", "name"),
+    ("Organization", "name"),
+    ("Team", "name"),
+    ("Location", "name"),
+    ("City", "name"),
+    ("Country", "name"),
+    ("Role", "name"),
+    ("Format", "name"),
+    ("Trophy", "name"),
+    ("Record", "type"),
+]
+
+# Lower-cased copies of the Person name properties, matched by the NLP person WHERE clause so it
+# doesn't call toLower() per row. toLower(null) is null, so absent aliases stay absent. Run by every
+# seed, and on its own by --backfill-lc for graphs loaded some other way.
+BACKFILL_LC = (
+    "MATCH (p:Person) "
+    "SET p.name_lc = toLower(p.name), p.full_name_lc = toLower(p.full_name), "
+    "p.nickname_lc = toLower(p.nickname)"
+)
+
+SACHIN = "Sachin Tendulkar"
+
+# Named entities, grouped per label. Each group is created with one UNWIND statement.
+NODES = {
+    "Person": [
+        {
+            "name": SACHIN,
+            "full_name": "Sachin Ramesh Tendulkar",
+            "nickname": "Little Master",
+            "batting_style": "Right-hand bat",
+            "bowling_style": "Right-arm offbreak/legbreak",
+            "birth_year": 1973,
+        },
+        # Coach persons
+        {"name": "Ramakant Achrekar"},
+        # Optional: Guru/mentor figures (for demo coverage)
+        {"name": "Sunil Gavaskar"},
+    ],
+    # Places
+    "City": [{"name": "Mumbai"}],
+    "Country": [{"name": "India"}],
+    # Teams and organizations
+    "Team": [
+        {"name": "India", "level": "International", "sport": "Cricket"},
+        {"name": "Mumbai", "level": "Domestic", "sport": "Cricket"},
+    ],
+    "Organization": [
+        {"name": "Mumbai Indians", "type": "IPL Franchise", "sport": "Cricket"},
+        {"name": "BCCI", "type": "Cricket Board"},
+        {"name": "ICC", "type": "Governing Body"},
+    ],
+    # Roles and formats
+    "Role": [{"name": "Batsman"}, {"name": "Opening Batsman"}, {"name": "Part-time Bowler"}],
+    "Format": [{"name": "Test"}, {"name": "ODI"}, {"name": "T20I"}, {"name": "IPL"}],
+    # Notable trophies
+    "Trophy": [{"name": "ICC Cricket World Cup 2011", "year": 2011}],
+}
+
+# Relationships between named entities: (start label, type, end label, rows).
+# Each row matches both ends by name; "props" become relationship properties.
+RELATIONSHIPS = [
+    # Link city to country (optional hierarchy)
+    ("City", "IN_COUNTRY", "Country", [{"start": "Mumbai", "end": "India", "props": {}}]),
+    # Birth and origin
+    ("Person", "BORN_IN", "City", [{"start": SACHIN, "end": "Mumbai", "props": {}}]),
+    # Career associations
+    ("Person", "REPRESENTED", "Team", [{"start": SACHIN, "end": "India", "props": {"from": 1989, "to": 2013}}]),
+    ("Person", "PLAYED_FOR", "Team", [{"start": SACHIN, "end": "Mumbai", "props": {"from": 1988, "to": 2013}}]),
+    (
+        "Person", "PLAYED_FOR", "Organization",
+        [{"start": SACHIN, "end": "Mumbai Indians", "props": {"from": 2008, "to": 2013}}],
+    ),
+    (
+        "Person", "CAPTAINED", "Team",
+        [{"start": SACHIN, "end": "India", "props": {"format": "International", "from": 1996, "to": 2000}}],
+    ),
+    # Roles over the career
+    ("Person", "ROLE_AS", "Role", [
+        {"start": SACHIN, "end": "Batsman", "props": {}},
+        {"start": SACHIN, "end": "Opening Batsman", "props": {}},
+        {"start": SACHIN, "end": "Part-time Bowler", "props": {}},
+    ]),
+    # Notable trophies
+    ("Team", "WON", "Trophy", [{"start": "India", "end": "ICC Cricket World Cup 2011", "props": {}}]),
+    ("Person", "WON", "Trophy", [{"start": SACHIN, "end": "ICC Cricket World Cup 2011", "props": {}}]),
+    # Affiliations to governing bodies (useful for generic Q&A)
+    ("Organization", "GOVERNS", "Team", [{"start": "BCCI", "end": "India", "props": {}}]),
+    ("Organization", "GOVERNS", "Organization", [{"start": "ICC", "end": "BCCI", "props": {}}]),
+    # City -> Team link (home association)
+    ("City", "HOME_TEAM", "Team", [{"start": "Mumbai", "end": "Mumbai", "props": {}}]),
+    # Coaching relationships for Sachin Tendulkar, stored one way only: (coach)-[:COACHED]->(student).
+    # Example: Gavaskar as an inspiration/mentor (using COACHED for demo purposes)
+    ("Person", "COACHED", "Person", [
+        {"start": "Ramakant Achrekar", "end": SACHIN, "props": {"from": 1984, "to": 1990}},
+        {"start": "Sunil Gavaskar", "end": SACHIN, "props": {"note": "Mentor/Inspiration"}},
+    ]),
+]
+
+# Record nodes hanging off Sachin, keyed by relationship type. Each row carries the Record
+# properties ("record") and the relationship properties ("props").
+SACHIN_RECORDS = {
+    "BORN_ON": [
+        {"record": {"type": "BirthDate", "label": "24 April 1973"}, "props": {"year": 1973, "month": 4, "day": 24}},
+    ],
+    # Debut and Retirement records
+    "DEBUTED_IN": [
+        {"record": {"type": "Debut", "format": "Test", "year": 1989, "opponent": "Pakistan", "location": "Karachi"},
+         "props": {}},
+        {"record": {"type": "Debut", "format": "ODI", "year": 1989, "opponent": "Pakistan", "location": "Gujranwala"},
+         "props": {}},
+    ],
+    "RETIRED_IN": [
+        {"record": {"type": "Retirement", "format": "Test", "year": 2013, "opponent": "West Indies",
+                    "location": "Mumbai"},
+         "props": {}},
+        {"record": {"type": "Retirement", "format": "ODI", "year": 2012, "opponent": "Pakistan", "location": "Mirpur"},
+         "props": {}},
+    ],
+    # Records (simplified)
+    "HOLDS_RECORD": [
+        {"record": {"type": "CareerRecord", "label": "Most ODI runs", "value": 18426, "unit": "runs"}, "props": {}},
+        {"record": {"type": "CareerRecord", "label": "Most international runs", "value": 34357, "unit": "runs"},
+         "props": {}},
+        {"record": {"type": "CareerRecord", "label": "100 international centuries", "value": 100,
+                    "unit": "centuries"},
+         "props": {}},
+        {"record": {"type": "CareerRecord", "label": "Most Test runs", "value": 15921, "unit": "runs"}, "props": {}},
+        {"record": {"type": "Milestone", "label": "First ODI double century by an Indian", "value": 200,
+                    "unit": "runs", "year": 2010, "opponent": "South Africa", "location": "Gwalior"},
+         "props": {}},
+    ],
+    # Format-wise stats (coarse-grained for demo)
+    "FORMAT_STATS": [
+        {"record": {"type": "Stats", "format": "Test", "matches": 200, "runs": 15921, "hundreds": 51,
+                    "fifties": 68, "average": 53.78},
+         "props": {}},
+        {"record": {"type": "Stats", "format": "ODI", "matches": 463, "runs": 18426, "hundreds": 49,
+                    "fifties": 96, "average": 44.83},
+         "props": {}},
+        {"record": {"type": "Stats", "format": "T20I", "matches": 1, "runs": 10, "hundreds": 0,
+                    "fifties": 0, "average": 10.0},
+         "props": {}},
+        {"record": {"type": "Stats", "format": "IPL", "matches": 78, "runs": 2334, "hundreds": 1,
+                    "fifties": 13, "average": 34.83},
+         "props": {}},
+    ],
+}
+
+
+def seed(tx) -> None:
+    """
+    Write the whole seed on one transaction: wipe, entities, relationships, then Record nodes.
+    """
+    # Clear existing demo data for relevant labels in a single statement
+    tx.run(
+        "MATCH (n) WHERE any(label IN labels(n) WHERE label IN $labels) DETACH DELETE n",
+        {"labels": SEED_LABELS},
+    ).consume()
+
+    # Create entities: one UNWIND per label keeps each statement small and its plan cacheable.
+    for label, rows in NODES.items():
+        tx.run(
+            f"UNWIND $rows AS row CREATE (n:{label}) SET n = row",
+            {"rows": rows},
+        ).consume()
+
+    # Lower-cased name copies for the person WHERE clause.
+    tx.run(BACKFILL_LC).consume()
+
+    # Connect named entities: one UNWIND per (start label, type, end label) group.
+    for start_label, rel_type, end_label, rows in RELATIONSHIPS:
+        tx.run(
+            f"UNWIND $rows AS row "
+            f"MATCH (a:{start_label} {{name: row.start}}) "
+            f"MATCH (b:{end_label} {{name: row.end}}) "
+            f"MERGE (a)-[rel:{rel_type}]->(b) "
+            f"SET rel = row.props",
+            {"rows": rows},
+        ).consume()
+
+    # Attach Record nodes (debuts, retirements, records, stats) to Sachin.
+    for rel_type, rows in SACHIN_RECORDS.items():
+        tx.run(
+            f"MATCH (p:Person {{name: $person}}) "
+            f"UNWIND $rows AS row "
+            f"CREATE (p)-[rel:{rel_type}]->(r:Record) "
+            f"SET r = row.record, rel = row.props",
+            {"person": SACHIN, "rows": rows},
+        ).consume()
+
 
 class Command(BaseCommand):
     help = "Seed a Sachin Tendulkar-centric knowledge graph with entities, relationships and facts."
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--backfill-lc",
+            action="store_true",
+            help=(
+                "Don't seed: only add the lower-cased Person name properties (name_lc, full_name_lc, "
+                "nickname_lc) that person questions match on, keeping existing data."
+            ),
+        )
+
+    def create_indexes(self):
+        # Schema changes cannot share a transaction with data writes, so indexes are created first.
+        # IF NOT EXISTS makes this a no-op on re-seeds; indexes survive the label wipe.
+        for label, prop in INDEXES:
+            neo4j_service.run_cypher(
+                f"CREATE INDEX {label.lower()}_{prop} IF NOT EXISTS FOR (n:{label}) ON (n.{prop})"
+            )
+
     def handle(self, *args, **options):
+        if options["backfill_lc"]:
+            self.stdout.write(self.style.NOTICE("Backfilling lower-cased Person names in Neo4j..."))
+            neo4j_service.run_write_tx(lambda tx: tx.run(BACKFILL_LC).consume())
+            self.stdout.write(self.style.SUCCESS("Backfill complete."))
+            return
+
         self.stdout.write(self.style.NOTICE("Seeding Sachin Tendulkar knowledge graph into Neo4j..."))
+        self.create_indexes()
 
-        # Clear existing demo data for relevant labels
-        neo4j_service.run_cypher("MATCH (n:Person) DETACH DELETE n")
-        neo4j_service.run_cypher("MATCH (n:Organization) DETACH DELETE n")
-        neo4j_service.run_cypher("MATCH (n:Team) DETACH DELETE n")
-        neo4j_service.run_cypher("MATCH (n:Country) DETACH DELETE n")
-        neo4j_service.run_cypher("MATCH (n:City) DETACH DELETE n")
-        neo4j_service.run_cypher("MATCH (n:Record) DETACH DELETE n")
-        neo4j_service.run_cypher("MATCH (n:Trophy) DETACH DELETE n")
-        neo4j_service.run_cypher("MATCH (n:Format) DETACH DELETE n")
-        neo4j_service.run_cypher("MATCH (n:Role) DETACH DELETE n")
-
-        # Create entities and biographical details
-        neo4j_service.run_cypher(
-            """
-            // Core person
-            CREATE (sachin:Person {
-                name: 'Sachin Tendulkar',
-                full_name: 'Sachin Ramesh Tendulkar',
-                nickname: 'Little Master',
-                batting_style: 'Right-hand bat',
-                bowling_style: 'Right-arm offbreak/legbreak',
-                birth_year: 1973
-            })
-
-            // Places
-            CREATE (mumbai:City {name: 'Mumbai'})
-            CREATE (maharashtra:Country {name: 'India'})
-
-            // Link city to country (optional hierarchy)
-            MERGE (mumbai)-[:IN_COUNTRY]->(maharashtra)
-
-            // Birth and origin
-            MERGE (sachin)-[:BORN_IN]->(mumbai)
-            MERGE (sachin)-[:BORN_ON {year: 1973, month: 4, day: 24}]->(:Record {type:'BirthDate', label:'24 April 1973'})
-
-            // Teams and organizations
-            CREATE (india:Team {name: 'India', level: 'International', sport: 'Cricket'})
-            CREATE (mumbaiTeam:Team {name: 'Mumbai', level: 'Domestic', sport: 'Cricket'})
-            CREATE (mi:Organization {name: 'Mumbai Indians', type: 'IPL Franchise', sport: 'Cricket'})
-            CREATE (bcci:Organization {name: 'BCCI', type: 'Cricket Board'})
-            CREATE (icc:Organization {name: 'ICC', type: 'Governing Body'})
-
-            // Roles and formats
-            CREATE (batsman:Role {name: 'Batsman'})
-            CREATE (opener:Role {name: 'Opening Batsman'})
-            CREATE (partTimeBowler:Role {name: 'Part-time Bowler'})
-            CREATE (test:Format {name: 'Test'})
-            CREATE (odi:Format {name: 'ODI'})
-            CREATE (t20i:Format {name: 'T20I'})
-            CREATE (ipl:Format {name: 'IPL'})
-
-            // Career associations
-            MERGE (sachin)-[:REPRESENTED {from: 1989, to: 2013}]->(india)
-            MERGE (sachin)-[:PLAYED_FOR {from: 1988, to: 2013}]->(mumbaiTeam)
-            MERGE (sachin)-[:PLAYED_FOR {from: 2008, to: 2013}]->(mi)
-            MERGE (sachin)-[:CAPTAINED {format: 'International', from: 1996, to: 2000}]->(india)
-
-            // Debut and Retirement records
-            CREATE (testDebut:Record {type:'Debut', format:'Test', year:1989, opponent:'Pakistan', location:'Karachi'})
-            CREATE (odiDebut:Record {type:'Debut', format:'ODI', year:1989, opponent:'Pakistan', location:'Gujranwala'})
-            CREATE (testRetire:Record {type:'Retirement', format:'Test', year:2013, opponent:'West Indies', location:'Mumbai'})
-            CREATE (odiRetire:Record {type:'Retirement', format:'ODI', year:2012, opponent:'Pakistan', location:'Mirpur'})
-
-            MERGE (sachin)-[:DEBUTED_IN]->(testDebut)
-            MERGE (sachin)-[:DEBUTED_IN]->(odiDebut)
-            MERGE (sachin)-[:RETIRED_IN]->(testRetire)
-            MERGE (sachin)-[:RETIRED_IN]->(odiRetire)
-
-            // Roles over the career
-            MERGE (sachin)-[:ROLE_AS]->(batsman)
-            MERGE (sachin)-[:ROLE_AS]->(opener)
-            MERGE (sachin)-[:ROLE_AS]->(partTimeBowler)
-
-            // Notable trophies
-            CREATE (cwc2011:Trophy {name:'ICC Cricket World Cup 2011', year:2011})
-            MERGE (india)-[:WON]->(cwc2011)
-            MERGE (sachin)-[:WON]->(cwc2011)
-
-            // Records (simplified)
-            CREATE (recMostODIRuns:Record {type:'CareerRecord', label:'Most ODI runs', value: 18426, unit: 'runs'})
-            CREATE (recMostIntlRuns:Record {type:'CareerRecord', label:'Most international runs', value: 34357, unit: 'runs'})
-            CREATE (rec100Intl100s:Record {type:'CareerRecord', label:'100 international centuries', value: 100, unit: 'centuries'})
-            CREATE (recMostTestRuns:Record {type:'CareerRecord', label:'Most Test runs', value: 15921, unit: 'runs'})
-            CREATE (recODIDouble:Record {type:'Milestone', label:'First ODI double century by an Indian', value: 200, unit: 'runs', year:2010, opponent:'South Africa', location:'Gwalior'})
-
-            MERGE (sachin)-[:HOLDS_RECORD]->(recMostODIRuns)
-            MERGE (sachin)-[:HOLDS_RECORD]->(recMostIntlRuns)
-            MERGE (sachin)-[:HOLDS_RECORD]->(rec100Intl100s)
-            MERGE (sachin)-[:HOLDS_RECORD]->(recMostTestRuns)
-            MERGE (sachin)-[:HOLDS_RECORD]->(recODIDouble)
-
-            // Format-wise stats (coarse-grained for demo)
-            CREATE (testStats:Record {type:'Stats', format:'Test', matches:200, runs:15921, hundreds:51, fifties:68, average:53.78})
-            CREATE (odiStats:Record {type:'Stats', format:'ODI', matches:463, runs:18426, hundreds:49, fifties:96, average:44.83})
-            CREATE (t20iStats:Record {type:'Stats', format:'T20I', matches:1, runs:10, hundreds:0, fifties:0, average:10.0})
-            CREATE (iplStats:Record {type:'Stats', format:'IPL', matches:78, runs:2334, hundreds:1, fifties:13, average:34.83})
-
-            MERGE (sachin)-[:FORMAT_STATS]->(testStats)
-            MERGE (sachin)-[:FORMAT_STATS]->(odiStats)
-            MERGE (sachin)-[:FORMAT_STATS]->(t20iStats)
-            MERGE (sachin)-[:FORMAT_STATS]->(iplStats)
-
-            // Affiliations to governing bodies (useful for generic Q&A)
-            MERGE (bcci)-[:GOVERNS]->(india)
-            MERGE (icc)-[:GOVERNS]->(bcci)
-
-            // City -> Team link (home association)
-            MERGE (mumbai)-[:HOME_TEAM]->(mumbaiTeam)
-
-            // --------------------------------------------
-            // Coaching relationships for Sachin Tendulkar
-            // --------------------------------------------
-            // Add coach persons
-            CREATE (achrekar:Person {name:'Ramakant Achrekar'})
-            // Optional: Guru/mentor figures (for demo coverage)
-            CREATE (gavaskar:Person {name:'Sunil Gavaskar'})
-
-            // Connect coaches to Sachin using both directions for robustness
-            MERGE (achrekar)-[:COACHED {from:1984, to:1990}]->(sachin)
-            MERGE (sachin)-[:COACHED_BY {from:1984, to:1990}]->(achrekar)
-
-            // Example: Gavaskar as an inspiration/mentor (using COACHED for demo purposes)
-            MERGE (gavaskar)-[:COACHED {note:'Mentor/Inspiration'}]->(sachin)
-            MERGE (sachin)-[:COACHED_BY {note:'Mentor/Inspiration'}]->(gavaskar)
-
-            RETURN 'ok' AS status
-            """
-        )
+        # One write transaction: a single commit, and a failed seed leaves the previous graph intact.
+        neo4j_service.run_write_tx(seed)
 
         self.stdout.write(self.style.SUCCESS("Sachin Tendulkar seed complete."))
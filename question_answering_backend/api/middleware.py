@@ -0,0 +1,16 @@
+from django.middleware.gzip import GZipMiddleware
+
+
+# PUBLIC_INTERFACE
+class NonStreamingGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware that leaves streamed responses (ask?stream=1) uncompressed.
+
+    Django compresses an async stream chunk by chunk, each as its own padded gzip member, which
+    makes the body larger and breaks clients that only decode the first member.
+    """
+
+    def process_response(self, request, response):
+        if response.streaming:
+            return response
+        return super().process_response(request, response)
@@ -3,26 +3,120 @@ Neo4j service module that manages a singleton driver and exposes a simple query
 
 Configuration:
 - Reads connection settings from environment variables (do not hardcode credentials)
-  NEO4J_URI          e.g. bolt://localhost:7687 or neo4j://host:7687
+  NEO4J_URI          e.g. bolt://localhost:7687, neo4j://host:7687 or neo4j+s://xxxx.databases.neo4j.io
   NEO4J_USER         database username
   NEO4J_PASSWORD     database password
   NEO4J_DATABASE     optional; defaults to 'neo4j'
+  NEO4J_MAX_CONNECTION_POOL_SIZE   optional; connections per driver, defaults to 50
+  NEO4J_MAX_CONNECTION_LIFETIME    optional; seconds before a pooled connection is recycled, defaults to 3600
+  NEO4J_CONNECTION_ACQUISITION_TIMEOUT  optional; seconds a query waits for a free pooled connection, defaults to 30
+  NEO4J_HEALTH_INTERVAL  optional; seconds between background health probes (ASGI server only), defaults to 5
 
 This module is intentionally lightweight and resilient:
 - If configuration is missing or connection fails, queries raise ValueError with a clear message.
 - Caller code (e.g., services) can catch and return nice API errors.
+- Parameters are passed to Neo4j as given; every parameter the query references must be supplied.
+- Synchronous callers (management commands, WSGI views) use run_cypher; coroutines use
+  run_cypher_async. That is backed by the neo4j asyncio driver once the ASGI entrypoint calls
+  enable_async_driver(), and by the sync driver in a worker thread otherwise.
 
 Notes:
 - Ensure a running Neo4j instance is reachable with the above credentials.
 """
 
+import asyncio
+import logging
+import math
 import os
-from typing import Any, Dict, List, Optional
+import sys
+import threading
+import time
+from functools import lru_cache
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
 
-from neo4j import GraphDatabase, basic_auth
-from neo4j.exceptions import Neo4jError, ServiceUnavailable, AuthError
+from asgiref.sync import sync_to_async
+from neo4j import AsyncGraphDatabase, GraphDatabase, basic_auth
+from neo4j.exceptions import DriverError, Neo4jError, ServiceUnavailable, AuthError
 import socket
 
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+# Bolt URI schemes the driver accepts. The +s (verified TLS) and +ssc (self-signed TLS) variants
+# carry their own encryption settings, so NEO4J_ENCRYPTED only applies to the plain ones.
+_PLAIN_SCHEMES = ("bolt", "neo4j")
+_TLS_SCHEMES = ("bolt+s", "bolt+ssc", "neo4j+s", "neo4j+ssc")
+
+# Everything the driver raises while running queries: server-side errors (Neo4jError, incl. AuthError)
+# and client-side ones (DriverError, incl. ServiceUnavailable and SessionExpired). These are wrapped
+# as ValueError for the API layer; anything else is a programming error and propagates unchanged.
+_QUERY_ERRORS = (Neo4jError, DriverError)
+
+
+# PUBLIC_INTERFACE
+def env_number(name: str, default: float, cast: Callable[[str], float] = float) -> float:
+    """
+    Read a numeric setting from the environment for code that runs at import or startup.
+
+    Unset or blank gives default; a malformed or non-finite value is logged and also gives default,
+    so a typo in one tuning knob can't take the whole process down.
+    """
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        value = cast(raw)
+        if isinstance(value, float) and not math.isfinite(value):
+            raise ValueError("not a finite number")
+    except ValueError:
+        logger.warning("Ignoring invalid %s=%r; using %r", name, raw, default)
+        return default
+    return value
+
+
+@lru_cache(maxsize=256)
+def _canonical_query(query: str) -> str:
+    """
+    Strip surrounding whitespace once per distinct query text and intern the result, so repeated
+    calls send byte-identical text and hit Neo4j's server-side plan cache (keyed on query text).
+    """
+    return sys.intern(query.strip())
+
+
+def _rows_as_dicts(result: Any) -> List[Dict[str, Any]]:
+    """
+    Materialize a result as a list of dict rows. Keys are fetched once and zipped with each
+    record (records are tuples), instead of Record.data() building and converting every row.
+    Values are returned as the driver decoded them, so queries should project properties
+    (as all NLP templates do) rather than return whole nodes.
+    """
+    keys = result.keys()
+    return [dict(zip(keys, record)) for record in result]
+
+
+def _rows_as_columns(result: Any) -> Tuple[List[str], List[tuple]]:
+    """
+    Materialize a result column-wise: the key list once plus one plain tuple per row.
+    """
+    keys = list(result.keys())
+    return keys, [tuple(record) for record in result]
+
+
+async def _stream_rows(session, result, keys) -> AsyncIterator[Dict[str, Any]]:
+    try:
+        async for record in result:
+            yield dict(zip(keys, record))
+    except _QUERY_ERRORS as exc:
+        raise ValueError(f"Neo4j query failed: {exc}") from exc
+    finally:
+        await session.close()
+
+
+async def _iterate_rows(rows: List[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+    for row in rows:
+        yield row
+
 
 class _Neo4jService:
     """
@@ -32,7 +126,18 @@ class _Neo4jService:
 
     def __init__(self) -> None:
         self._driver = None  # lazy init
+        self._driver_lock = threading.Lock()
+        self._async_driver = None  # lazy init, bound to the event loop that created it
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_lock = threading.Lock()
+        self._use_async_driver = False  # see enable_async_driver
+        self._driver_args: Dict[str, Any] = {}
         self._config_err: Optional[str] = None
+        self._database = "neo4j"  # resolved once from NEO4J_DATABASE in _ensure_driver
+        self.write_version = 0  # bumped after every committed write transaction; read caches key on it
+        self._health: Optional[Tuple[float, bool, Optional[str]]] = None  # (checked_at, ok, error)
+        self._health_thread: Optional[threading.Thread] = None
+        self._health_lock = threading.Lock()
 
     def _get_env(self) -> Dict[str, Optional[str]]:
         return {
@@ -46,11 +151,22 @@ class _Neo4jService:
         """
         Initialize the driver if not present. Any configuration or connection error will be
         captured and surfaced on query attempts.
+
+        Creation is serialized so concurrent first callers (e.g. the health monitor and warm-up
+        threads) don't each build a driver and leak all but one pool.
         """
         if self._driver is not None or self._config_err:
             return
+        with self._driver_lock:
+            if self._driver is None and not self._config_err:
+                self._init_driver()
 
+    def _init_driver(self) -> None:
+        """
+        Validate the configuration and create the sync driver; called by _ensure_driver.
+        """
         env = self._get_env()
+        self._database = env["database"] or "neo4j"
         missing = [k for k, v in env.items() if k in ("uri", "user", "password") and (v is None or v == "")]
         if missing:
             self._config_err = (
@@ -61,10 +177,12 @@ class _Neo4jService:
 
         # Basic URI validation and hints for common pitfalls
         uri = env["uri"] or ""
-        if not (uri.startswith("bolt://") or uri.startswith("neo4j://")):
+        scheme = uri.split("://", 1)[0] if "://" in uri else ""
+        if scheme not in _PLAIN_SCHEMES + _TLS_SCHEMES:
             self._config_err = (
                 "Invalid NEO4J_URI scheme. Use bolt://host:7687 for direct connections or "
-                "neo4j://host:7687 for Neo4j Aura or DNS-SRV based routing."
+                "neo4j://host:7687 for Neo4j Aura or DNS-SRV based routing; add +s (e.g. neo4j+s://) "
+                "for TLS. Neo4j's HTTP endpoints are not supported."
             )
             return
 
@@ -73,6 +191,20 @@ class _Neo4jService:
             encrypted_env = os.getenv("NEO4J_ENCRYPTED", "").strip().lower()
             encrypted = encrypted_env in ("1", "true", "yes", "on")
 
+            # Pool tuning: bursts beyond the pool size wait for a free connection
+            # (up to connection_acquisition_timeout) instead of opening new ones.
+            try:
+                max_pool_size = int(os.getenv("NEO4J_MAX_CONNECTION_POOL_SIZE", "50"))
+                max_lifetime = int(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600"))
+                acquisition_timeout = float(os.getenv("NEO4J_CONNECTION_ACQUISITION_TIMEOUT", "30"))
+            except ValueError as exc:
+                self._config_err = (
+                    "Invalid Neo4j pool setting. NEO4J_MAX_CONNECTION_POOL_SIZE and "
+                    "NEO4J_MAX_CONNECTION_LIFETIME must be integers and "
+                    f"NEO4J_CONNECTION_ACQUISITION_TIMEOUT a number. Details: {exc}"
+                )
+                return
+
             # Basic DNS resolution pre-check to give clearer errors before driver tries to connect
             try:
                 # Extract hostname portion for a quick getaddrinfo check
@@ -90,7 +222,17 @@ class _Neo4jService:
             auth = basic_auth(env["user"], env["password"])
             # Create the driver (does not verify connection until used).
             # Pass encrypted if requested; the driver defaults are usually fine for TLS too.
-            self._driver = GraphDatabase.driver(uri, auth=auth, encrypted=encrypted)  # type: ignore[arg-type]
+            # The same arguments are reused for the asyncio driver.
+            self._driver_args = {
+                "uri": uri,
+                "auth": auth,
+                "max_connection_pool_size": max_pool_size,
+                "max_connection_lifetime": max_lifetime,
+                "connection_acquisition_timeout": acquisition_timeout,
+            }
+            if scheme in _PLAIN_SCHEMES:
+                self._driver_args["encrypted"] = encrypted
+            self._driver = GraphDatabase.driver(**self._driver_args)  # type: ignore[arg-type]
         except (AuthError, ServiceUnavailable, Neo4jError) as exc:
             self._config_err = (
                 "Failed to initialize Neo4j driver. Check credentials, URI, and network. "
@@ -99,6 +241,68 @@ class _Neo4jService:
         except Exception as exc:  # broad fallback with clear message
             self._config_err = f"Unexpected error initializing Neo4j driver: {exc}"
 
+    # PUBLIC_INTERFACE
+    def enable_async_driver(self) -> None:
+        """
+        Back the *_async methods with the asyncio driver. Call once from an ASGI entrypoint, where
+        one long-lived event loop serves every request.
+
+        Until then (WSGI, runserver, tests, management commands) async views run on a throwaway
+        loop per request (async_to_sync), and an asyncio driver would open a new pool each time,
+        so the *_async methods run the sync driver in a worker thread instead.
+        """
+        self._use_async_driver = True
+
+    @property
+    def async_driver_enabled(self) -> bool:
+        return self._use_async_driver
+
+    @property
+    def max_connection_pool_size(self) -> int:
+        """
+        Connections per driver, from NEO4J_MAX_CONNECTION_POOL_SIZE (default 50). Read from the
+        environment without creating the driver, so it never blocks an event loop on DNS or driver
+        setup. Malformed or non-positive values give the default; queries report malformed ones.
+        """
+        size = int(env_number("NEO4J_MAX_CONNECTION_POOL_SIZE", 50, int))
+        return size if size > 0 else 50
+
+    def _ensure_async_driver(self) -> None:
+        """
+        Initialize the asyncio driver for the running event loop. Configuration is validated by
+        _ensure_driver; errors are surfaced on query attempts just like the sync path.
+
+        Async driver connections belong to the loop that created them. There is one driver at a
+        time: if a different loop shows up (e.g. the ASGI server replaced its loop), the previous
+        driver is closed on its own loop and a new one is created, under a lock so concurrent
+        callers don't each build one.
+        """
+        self._ensure_driver()
+        if self._config_err:
+            return
+
+        loop = asyncio.get_running_loop()
+        with self._async_lock:
+            if self._async_driver is not None and self._async_loop is loop:
+                return
+            stale, stale_loop = self._async_driver, self._async_loop
+            self._async_driver, self._async_loop = None, None
+            try:
+                self._async_driver = AsyncGraphDatabase.driver(**self._driver_args)  # type: ignore[arg-type]
+                self._async_loop = loop
+            except (AuthError, ServiceUnavailable, Neo4jError) as exc:
+                self._config_err = (
+                    "Failed to initialize Neo4j async driver. Check credentials, URI, and network. "
+                    f"Details: {exc}"
+                )
+            except Exception as exc:  # broad fallback with clear message
+                self._config_err = f"Unexpected error initializing Neo4j async driver: {exc}"
+
+        # A driver can only be closed on its own loop. If that loop is gone its connections can't
+        # be shut down cleanly any more and are left to the garbage collector.
+        if stale is not None and stale_loop is not None and stale_loop.is_running():
+            asyncio.run_coroutine_threadsafe(stale.close(), stale_loop)
+
     # PUBLIC_INTERFACE
     def run_cypher(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
@@ -111,6 +315,54 @@ class _Neo4jService:
         Returns:
             List of dictionaries (each row as a key-value dict)
 
+        Raises:
+            ValueError if configuration/connection error occurs.
+        """
+        return self._run(query, parameters, _rows_as_dicts, [])
+
+    # PUBLIC_INTERFACE
+    def run_cypher_columnar(
+        self, query: str, parameters: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[str], List[tuple]]:
+        """
+        Execute a Cypher query and return its rows column-wise: (keys, rows) where every row is a
+        tuple aligned with keys. Cheaper to build than dict rows and directly JSON-serializable.
+
+        Raises:
+            ValueError if configuration/connection error occurs.
+        """
+        return self._run(query, parameters, _rows_as_columns, ([], []))
+
+    def _run(self, query: str, parameters: Optional[Dict[str, Any]], materialize: Callable[[Any], T], empty: T) -> T:
+        """
+        Shared sync execution path: run the query in a session and let materialize() consume the result.
+        """
+        self._ensure_driver()
+        if self._config_err:
+            raise ValueError(self._config_err)
+
+        if not query or not isinstance(query, str):
+            return empty
+
+        query = _canonical_query(query)
+        driver = self._driver
+        database = self._database
+
+        try:
+            with driver.session(database=database) as session:  # type: ignore[union-attr]
+                return materialize(session.run(query, parameters or {}))
+        except _QUERY_ERRORS as exc:
+            raise ValueError(f"Neo4j query failed: {exc}") from exc
+
+    # PUBLIC_INTERFACE
+    def run_cypher_batch(
+        self, statements: Sequence[Tuple[str, Optional[Dict[str, Any]]]]
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Execute several read queries in one session and one managed read transaction, returning
+        the rows of each statement in order. Compared to calling run_cypher per statement this
+        pays for connection checkout, BEGIN and COMMIT once instead of once per query.
+
         Raises:
             ValueError if configuration/connection error occurs.
         """
@@ -118,46 +370,172 @@ class _Neo4jService:
         if self._config_err:
             raise ValueError(self._config_err)
 
+        if not statements:
+            return []
+
+        batch = [(_canonical_query(query), parameters) for query, parameters in statements]
+        driver = self._driver
+
+        def work(tx) -> List[List[Dict[str, Any]]]:
+            return [_rows_as_dicts(tx.run(query, parameters or {})) for query, parameters in batch]
+
+        try:
+            with driver.session(database=self._database) as session:  # type: ignore[union-attr]
+                return session.execute_read(work)
+        except _QUERY_ERRORS as exc:
+            raise ValueError(f"Neo4j query failed: {exc}") from exc
+
+    # PUBLIC_INTERFACE
+    async def run_cypher_async(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Coroutine counterpart of run_cypher using the neo4j asyncio driver, so an event loop can
+        overlap many in-flight queries instead of blocking a worker thread per Bolt round-trip.
+
+        Args:
+            query: Cypher query string
+            parameters: Optional dict of parameters
+
+        Returns:
+            List of dictionaries (each row as a key-value dict)
+
+        Raises:
+            ValueError if configuration/connection error occurs.
+        """
+        if not self._use_async_driver:
+            return await sync_to_async(self.run_cypher, thread_sensitive=False)(query, parameters)
+
+        self._ensure_async_driver()
+        if self._config_err:
+            raise ValueError(self._config_err)
+
         if not query or not isinstance(query, str):
             return []
 
-        params = parameters or {}
-        env = self._get_env()
-        database = env["database"] or "neo4j"
+        query = _canonical_query(query)
+        driver = self._async_driver
+        database = self._database
 
         try:
-            assert self._driver is not None  # for type-checkers
-            with self._driver.session(database=database) as session:
-                # Defensive normalization of person/persons parameters:
-                # If the Cypher uses either $person or $persons and the other is provided,
-                # normalize so both are available to prevent "Expected parameter(s)" errors.
-                # This is safe as unused parameters are ignored by Neo4j.
-                try:
-                    # Make a shallow copy to avoid mutating caller's dict
-                    params = dict(params)
-                    if "persons" in params and "person" not in params:
-                        # Provide a single person convenience if a list is supplied
-                        lst = params.get("persons") or []
-                        if isinstance(lst, (list, tuple)) and lst:
-                            params["person"] = lst[0]
-                    if "person" in params and "persons" not in params:
-                        # Provide a list convenience if single person is supplied
-                        p = params.get("person")
-                        if isinstance(p, str) and p != "":
-                            params["persons"] = [p]
-                except Exception:
-                    # Do not fail normalization; proceed with original params
-                    pass
-
-                result = session.run(query, **params)
-                # Safe materialization to list of dict rows
-                rows: List[Dict[str, Any]] = [record.data() for record in result]  # type: ignore
+            async with driver.session(database=database) as session:  # type: ignore[union-attr]
+                result = await session.run(query, parameters or {})
+                keys = await result.keys()
+                rows: List[Dict[str, Any]] = [dict(zip(keys, record)) async for record in result]
                 return rows
-        except (AuthError, ServiceUnavailable, Neo4jError) as exc:
+        except _QUERY_ERRORS as exc:
             raise ValueError(f"Neo4j query failed: {exc}") from exc
-        except Exception as exc:
-            # Any unexpected error is wrapped as ValueError for the API layer
-            raise ValueError(f"Unexpected error running Cypher: {exc}") from exc
+
+    # PUBLIC_INTERFACE
+    async def stream_cypher_async(
+        self, query: str, parameters: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run a query on the asyncio driver and return an async iterator over its rows as they
+        arrive, so callers can forward rows without materializing the whole result.
+
+        The query is sent before this returns, so configuration and query errors are raised
+        here. The session stays open until the iterator is exhausted or closed; errors while
+        fetching later rows are raised from the iterator.
+
+        Without the asyncio driver (see enable_async_driver) the rows are fetched in a worker
+        thread up front and the iterator replays them.
+
+        Raises:
+            ValueError if configuration/connection error occurs.
+        """
+        if not self._use_async_driver:
+            rows = await sync_to_async(self.run_cypher, thread_sensitive=False)(query, parameters)
+            return _iterate_rows(rows)
+
+        self._ensure_async_driver()
+        if self._config_err:
+            raise ValueError(self._config_err)
+
+        session = self._async_driver.session(database=self._database)  # type: ignore[union-attr]
+        try:
+            result = await session.run(_canonical_query(query), parameters or {})
+            keys = await result.keys()
+        except _QUERY_ERRORS as exc:
+            await session.close()
+            raise ValueError(f"Neo4j query failed: {exc}") from exc
+        except BaseException:
+            await session.close()
+            raise
+        return _stream_rows(session, result, keys)
+
+    # PUBLIC_INTERFACE
+    def run_write_tx(self, work: Callable[[Any], T]) -> T:
+        """
+        Run work(tx) inside a single managed write transaction and return its result.
+        Every statement issued on tx commits together (or not at all), and the driver retries
+        work on transient failures, so it must not have side effects outside the transaction.
+
+        Raises:
+            ValueError if configuration/connection error occurs.
+        """
+        self._ensure_driver()
+        if self._config_err:
+            raise ValueError(self._config_err)
+
+        driver = self._driver
+        try:
+            with driver.session(database=self._database) as session:  # type: ignore[union-attr]
+                result = session.execute_write(work)
+        except _QUERY_ERRORS as exc:
+            raise ValueError(f"Neo4j transaction failed: {exc}") from exc
+        self.write_version += 1
+        return result
+
+    # PUBLIC_INTERFACE
+    def warm_up(self, statements: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        Run each (query, parameters) pair once so Neo4j parses and plans it ahead of real traffic.
+        Plans are cached per query text and parameter types, so pass representative parameters.
+
+        Failures are ignored: warm-up is best-effort and must never break startup.
+
+        Returns:
+            Number of statements that ran successfully.
+        """
+        warmed = 0
+        for query, parameters in statements:
+            try:
+                self.run_cypher(query, parameters)
+                warmed += 1
+            except ValueError:
+                continue
+        return warmed
+
+    # PUBLIC_INTERFACE
+    def start_health_monitor(self, interval: float) -> None:
+        """
+        Probe Neo4j with a trivial query every `interval` seconds on a daemon thread, keeping the
+        latest outcome for last_health(). Only the first call starts a thread.
+        """
+        with self._health_lock:
+            if self._health_thread is not None:
+                return
+            self._health = (time.monotonic(), False, "Neo4j health probe has not completed yet.")
+            self._health_thread = threading.Thread(
+                target=self._monitor_health, args=(interval,), name="neo4j-health", daemon=True
+            )
+            self._health_thread.start()
+
+    def _monitor_health(self, interval: float) -> None:
+        while True:
+            try:
+                rows = self.run_cypher("RETURN 1 AS ok")
+                self._health = (time.monotonic(), bool(rows and rows[0].get("ok") == 1), None)
+            except ValueError as exc:
+                self._health = (time.monotonic(), False, str(exc))
+            time.sleep(interval)
+
+    # PUBLIC_INTERFACE
+    def last_health(self) -> Optional[Tuple[float, bool, Optional[str]]]:
+        """
+        Latest background probe as (checked_at, ok, error), checked_at on the time.monotonic()
+        clock and error None on success; None when the health monitor is not running.
+        """
+        return self._health
 
     # PUBLIC_INTERFACE
     def close(self) -> None:
@@ -170,6 +548,16 @@ class _Neo4jService:
             finally:
                 self._driver = None
 
+    # PUBLIC_INTERFACE
+    async def close_async(self) -> None:
+        """
+        Close the asyncio driver (call from the event loop that uses it, e.g. an ASGI shutdown hook).
+        """
+        with self._async_lock:
+            driver, self._async_driver, self._async_loop = self._async_driver, None, None
+        if driver is not None:
+            await driver.close()
+
 
 # Create a singleton-like service instance for easy importing
 neo4j_service = _Neo4jService()
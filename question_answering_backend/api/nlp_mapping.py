@@ -6,12 +6,226 @@ This module intentionally keeps logic straightforward and well-documented so it
 can act as a teaching reference. You can extend RuleBasedNLPMappings with more
 patterns over time.
 """
-from dataclasses import dataclass
-from typing import Dict, Optional, List
+import re
+import sys
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple, Optional, List, Tuple
+
+# Canonical entity name used by the Sachin-specific rules; interned so every params dict shares it.
+_SACHIN = sys.intern("Sachin Tendulkar")
+_SACHIN_LC = sys.intern(_SACHIN.lower())
+# Constant part of every Sachin rule's parameters; handlers copy it and add top_k (and format).
+# persons_lc is a tuple so the shared value cannot be mutated through one of the copies.
+_SACHIN_BASE: Dict[str, Any] = {"persons_lc": (_SACHIN_LC,)}
+
+_STRIP_DOTS = str.maketrans("", "", ".")
+
+# Alias expansions for known demo names, keyed by the stripped, lower-cased input (questions are
+# lower-cased before matching). Hits skip the generic heuristic in _normalize_person_input.
+_ALIAS_MAP: Dict[str, Tuple[str, ...]] = {
+    "sachin tendulkar": (_SACHIN,),
+    "s tendulkar": (_SACHIN, "s tendulkar"),
+    "s. tendulkar": (_SACHIN, "s. tendulkar", "s tendulkar"),
+}
+
+
+def _person_where_clause(field: str = "p") -> str:
+    """
+    Build a reusable Cypher WHERE clause that matches Person by:
+    - case-insensitive substring (CONTAINS) of the name
+    - matching against common alias properties if present (full_name, nickname)
+
+    Matching runs on the lower-cased name_lc / full_name_lc / nickname_lc properties written at
+    ingest (see the seed_graph command), so no toLower() runs per row. A CONTAINS inside ANY over
+    a list parameter cannot be served by an index, so the Person candidates are scanned by label.
+
+    Usage: ... MATCH (p:Person) WHERE <clause> ...
+    It expects the lower-cased name variants as a list parameter: $persons_lc
+    """
+    # Absent alias properties are null and null CONTAINS x is never true, so no coalesce is needed.
+    return (
+        "("
+        " ANY(personParam IN $persons_lc WHERE "
+        "   {f}.name_lc CONTAINS personParam OR "
+        "   {f}.full_name_lc CONTAINS personParam OR "
+        "   {f}.nickname_lc CONTAINS personParam"
+        " )"
+        ")"
+    ).format(f=field)
+
+
+# Clause shared by every person-centric template (all of them bind the Person node as "p").
+_PERSON_WHERE = _person_where_clause("p")
+
+# -------------------------
+# Cypher templates, built once at import
+# -------------------------
+
+_CYPHER_WORKS_AT = (
+    "MATCH (p:Person)-[:WORKS_AT]->(o:Organization {name: $org}) "
+    "RETURN p.name AS person LIMIT $top_k"
+)
+
+_CYPHER_LOCATED = (
+    "MATCH (p:Person)-[:LOCATED_IN]->(l:Location) "
+    f"WHERE {_PERSON_WHERE} "
+    "RETURN l.name AS location LIMIT $top_k"
+)
+
+_CYPHER_PEOPLE_IN = (
+    "MATCH (o:Organization {name: $org})<-[:WORKS_AT]-(p:Person) "
+    "RETURN p.name AS person ORDER BY p.name LIMIT $top_k"
+)
+
+_CYPHER_AFFILIATED = (
+    "MATCH (p:Person)-[:WORKS_AT]->(o:Organization) "
+    f"WHERE {_PERSON_WHERE} "
+    "RETURN o.name AS organization ORDER BY o.name LIMIT $top_k"
+)
+
+# Coaching is stored in one direction only, (coach)-[:COACHED]->(student); traverse it backwards.
+_CYPHER_COACH = (
+    "MATCH (p:Person) "
+    f"WHERE {_PERSON_WHERE} "
+    "MATCH (coach:Person)-[:COACHED]->(p) "
+    "RETURN DISTINCT coach.name AS coach "
+    "LIMIT $top_k"
+)
+
+_CYPHER_WHO_IS = (
+    "MATCH (p:Person) "
+    f"WHERE {_PERSON_WHERE} "
+    "OPTIONAL MATCH (p)-[:WORKS_AT]->(o:Organization) "
+    "OPTIONAL MATCH (p)-[:LOCATED_IN]->(l:Location) "
+    "RETURN p.name AS person, o.name AS organization, l.name AS location "
+    "LIMIT $top_k"
+)
+
+_CYPHER_TEAMS = (
+    "MATCH (p:Person)-[:PLAYED_FOR|:REPRESENTED|:CAPTAINED]->(t) "
+    f"WHERE {_PERSON_WHERE} "
+    "RETURN DISTINCT t.name AS team "
+    "ORDER BY team "
+    "LIMIT $top_k"
+)
+
+_CYPHER_RECORDS = (
+    "MATCH (p:Person)-[:HOLDS_RECORD]->(r:Record) "
+    f"WHERE {_PERSON_WHERE} "
+    "RETURN r.label AS record, r.value AS value, r.unit AS unit, r.year AS year "
+    "ORDER BY record "
+    "LIMIT $top_k"
+)
+
+_CYPHER_DEBUT = (
+    "MATCH (p:Person)-[:DEBUTED_IN]->(d:Record {type:'Debut'}) "
+    f"WHERE {_PERSON_WHERE} "
+    "AND (($format IS NULL) OR toLower(d.format) = toLower($format)) "
+    "RETURN d.format AS format, d.year AS year, d.opponent AS opponent, d.location AS location "
+    "ORDER BY d.year ASC "
+    "LIMIT $top_k"
+)
+
+_CYPHER_RETIREMENT = (
+    "MATCH (p:Person)-[:RETIRED_IN]->(r:Record {type:'Retirement'}) "
+    f"WHERE {_PERSON_WHERE} "
+    "AND (($format IS NULL) OR toLower(r.format) = toLower($format)) "
+    "RETURN r.format AS format, r.year AS year, r.opponent AS opponent, r.location AS location "
+    "ORDER BY r.year ASC "
+    "LIMIT $top_k"
+)
+
+_CYPHER_STATS = (
+    "MATCH (p:Person)-[:FORMAT_STATS]->(s:Record {type:'Stats'}) "
+    f"WHERE {_PERSON_WHERE} "
+    "AND (($format IS NULL) OR toLower(s.format) = toLower($format)) "
+    "RETURN s.format AS format, s.matches AS matches, s.runs AS runs, "
+    "s.hundreds AS hundreds, s.fifties AS fifties, s.average AS average "
+    "ORDER BY s.format "
+    "LIMIT $top_k"
+)
+
+_CYPHER_BIRTHPLACE = (
+    "MATCH (p:Person)-[:BORN_IN]->(c:City) "
+    f"WHERE {_PERSON_WHERE} "
+    "OPTIONAL MATCH (c)-[:IN_COUNTRY]->(country:Country) "
+    "RETURN c.name AS city, country.name AS country "
+    "LIMIT $top_k"
+)
+
+_CYPHER_ABOUT = (
+    "MATCH (p:Person) "
+    f"WHERE {_PERSON_WHERE} "
+    "OPTIONAL MATCH (p)-[:BORN_IN]->(city:City) "
+    "OPTIONAL MATCH (p)-[:FORMAT_STATS]->(s:Record {type:'Stats'}) "
+    "RETURN p.name AS name, p.full_name AS full_name, p.nickname AS nickname, "
+    "p.batting_style AS batting_style, p.bowling_style AS bowling_style, "
+    "p.birth_year AS birth_year, city.name AS birth_city, "
+    "collect({format:s.format, runs:s.runs, matches:s.matches, hundreds:s.hundreds, fifties:s.fifties, "
+    "average:s.average}) AS formats "
+    "LIMIT 1"
+)
+
+# An entity in a generic rule: any text with at least one character besides "?" and whitespace,
+# so a question like "who works at ??" names nothing and maps to no rule.
+_ENTITY = r"[?\s]*[^?\s].*?"
+
+# Generic demo rules compiled into one anchored alternation. Each rule's named group captures
+# its entity, so m.lastgroup names the rule that matched. Order matters: more specific prefixes
+# ("who is the coach of") must come before the shorter ones they overlap with ("who is"), and
+# "coach of ?" must not fall back to "coach " with "of" as the entity.
+# The "located" and "affiliated with" questions end in exactly one "?"; the others take any number.
+_GENERIC_RULES_RE = re.compile(
+    r"^(?:"
+    rf"who works at (?P<works_at>{_ENTITY})\?*"
+    rf"|where is (?P<located>{_ENTITY}) located\?"
+    rf"|list people in (?P<people_in>{_ENTITY})\?*"
+    rf"|what organizations is (?P<affiliated>{_ENTITY}) affiliated with\?"
+    rf"|(?:who is the coach of |who coached |coach of |coach (?!of ))(?P<coach>{_ENTITY})\?*"
+    rf"|who is (?P<who_is>{_ENTITY})\?*"
+    r")$"
+)
+
+# Sachin-specific rules, one named group per template, tried in the original rule order. Like the
+# original substring checks, each rule only requires its phrases to appear somewhere in the
+# question, in any order: every alternative is a set of lookaheads from the start of the question
+# (or an exact canned question). DOTALL keeps ".*?" scanning across line breaks as "in" did.
+_SACHIN_RULES_RE = re.compile(
+    r"(?:"
+    r"(?P<teams>(?=.*?what teams did)(?=.*?sachin tendulkar)(?=.*?play for)"
+    r"|teams sachin tendulkar played for\?$)"
+    r"|(?P<records>(?=.*?what records does)(?=.*?sachin tendulkar)(?=.*?hold)"
+    r"|(?:sachin tendulkar records|records of sachin tendulkar)\?$)"
+    r"|(?P<debut>(?=.*?when did)(?=.*?sachin tendulkar)(?=.*?debut))"
+    r"|(?P<retirement>(?=.*?when did)(?=.*?sachin tendulkar)(?=.*?retire))"
+    r"|(?P<stats>(?=.*?(?:career statistics|stats) of)(?=.*?sachin tendulkar))"
+    r"|(?P<birthplace>(?=.*?where was)(?=.*?sachin tendulkar)(?=.*?born)"
+    r"|(?:sachin tendulkar birthplace|birthplace of sachin tendulkar)\?$)"
+    r"|(?P<about>tell me about .*?sachin tendulkar|(?:about|who is) sachin tendulkar\?*$)"
+    r")",
+    re.DOTALL,
+)
+
+# Cricket format keywords, mapped to the format names seeded in the graph. "International" has no
+# Stats/Debut node of its own (it spans several formats), so it is not listed: no match means
+# "all formats".
+_FORMAT_RE = re.compile(r"\b(test|odi|t20i?|ipl)s?\b")
+_FORMAT_NAMES = {"test": "Test", "odi": "ODI", "t20": "T20I", "t20i": "T20I", "ipl": "IPL"}
+# When a question names several formats, the earliest entry here wins (not the first mentioned).
+_FORMAT_PRECEDENCE = ("Test", "ODI", "T20I", "IPL")
+
+
+def _extract_format(text: str) -> Optional[str]:
+    """
+    Return the cricket format mentioned in text, or None to match all formats.
+    """
+    found = {_FORMAT_NAMES[keyword] for keyword in _FORMAT_RE.findall(text)}
+    if len(found) > 1:
+        return next(name for name in _FORMAT_PRECEDENCE if name in found)
+    return found.pop() if found else None
 
 
-@dataclass
-class CypherQuery:
+class CypherQuery(NamedTuple):
     """
     Represents a Cypher query and associated parameters.
     """
@@ -35,25 +249,25 @@ class RuleBasedNLPMappings:
     - "what teams did sachin tendulkar play for?"
       Example Cypher:
         MATCH (p:Person)-[:PLAYED_FOR|:REPRESENTED|:CAPTAINED]->(t)
-        WHERE toLower(p.name) CONTAINS toLower($person)
-           OR toLower(coalesce(p.full_name, '')) CONTAINS toLower($person)
-           OR toLower(coalesce(p.nickname, '')) CONTAINS toLower($person)
+        WHERE ANY(x IN $persons_lc WHERE p.name_lc CONTAINS x
+           OR p.full_name_lc CONTAINS x
+           OR p.nickname_lc CONTAINS x)
         RETURN DISTINCT t.name AS team
         LIMIT $TOP_K
     - "what records does sachin tendulkar hold?"
       Example Cypher:
         MATCH (p:Person)-[:HOLDS_RECORD]->(r:Record)
-        WHERE toLower(p.name) CONTAINS toLower($person)
-           OR toLower(coalesce(p.full_name, '')) CONTAINS toLower($person)
-           OR toLower(coalesce(p.nickname, '')) CONTAINS toLower($person)
+        WHERE ANY(x IN $persons_lc WHERE p.name_lc CONTAINS x
+           OR p.full_name_lc CONTAINS x
+           OR p.nickname_lc CONTAINS x)
         RETURN r.label AS record, r.value AS value, r.unit AS unit, r.year AS year
         LIMIT $TOP_K
     - "when did sachin tendulkar debut in odi/test/international cricket?"
       Example Cypher (format-aware):
         MATCH (p:Person)-[:DEBUTED_IN]->(d:Record {type:'Debut'})
-        WHERE (toLower(p.name) CONTAINS toLower($person)
-           OR toLower(coalesce(p.full_name, '')) CONTAINS toLower($person)
-           OR toLower(coalesce(p.nickname, '')) CONTAINS toLower($person))
+        WHERE (ANY(x IN $persons_lc WHERE p.name_lc CONTAINS x
+           OR p.full_name_lc CONTAINS x
+           OR p.nickname_lc CONTAINS x))
           AND (($format IS NULL) OR toLower(d.format) = toLower($format))
         RETURN d.format AS format, d.year AS year, d.opponent AS opponent, d.location AS location
         ORDER BY d.year ASC
@@ -61,18 +275,18 @@ class RuleBasedNLPMappings:
     - "when did sachin tendulkar retire?"
       Example Cypher:
         MATCH (p:Person)-[:RETIRED_IN]->(r:Record {type:'Retirement'})
-        WHERE toLower(p.name) CONTAINS toLower($person)
-           OR toLower(coalesce(p.full_name, '')) CONTAINS toLower($person)
-           OR toLower(coalesce(p.nickname, '')) CONTAINS toLower($person)
+        WHERE ANY(x IN $persons_lc WHERE p.name_lc CONTAINS x
+           OR p.full_name_lc CONTAINS x
+           OR p.nickname_lc CONTAINS x)
         RETURN r.format AS format, r.year AS year, r.opponent AS opponent, r.location AS location
         ORDER BY r.year ASC
         LIMIT $TOP_K
     - "what are the career statistics of sachin tendulkar in odi/test/international?"
       Example Cypher (format-aware):
         MATCH (p:Person)-[:FORMAT_STATS]->(s:Record {type:'Stats'})
-        WHERE (toLower(p.name) CONTAINS toLower($person)
-           OR toLower(coalesce(p.full_name, '')) CONTAINS toLower($person)
-           OR toLower(coalesce(p.nickname, '')) CONTAINS toLower($person))
+        WHERE (ANY(x IN $persons_lc WHERE p.name_lc CONTAINS x
+           OR p.full_name_lc CONTAINS x
+           OR p.nickname_lc CONTAINS x))
           AND (($format IS NULL) OR toLower(s.format) = toLower($format))
         RETURN s.format AS format, s.matches AS matches, s.runs AS runs, s.hundreds AS hundreds, s.fifties AS fifties, s.average AS average
         ORDER BY s.format
@@ -80,18 +294,18 @@ class RuleBasedNLPMappings:
     - "where was sachin tendulkar born?"
       Example Cypher:
         MATCH (p:Person)-[:BORN_IN]->(c:City)
-        WHERE toLower(p.name) CONTAINS toLower($person)
-           OR toLower(coalesce(p.full_name, '')) CONTAINS toLower($person)
-           OR toLower(coalesce(p.nickname, '')) CONTAINS toLower($person)
+        WHERE ANY(x IN $persons_lc WHERE p.name_lc CONTAINS x
+           OR p.full_name_lc CONTAINS x
+           OR p.nickname_lc CONTAINS x)
         OPTIONAL MATCH (c)-[:IN_COUNTRY]->(country:Country)
         RETURN c.name AS city, country.name AS country
         LIMIT $TOP_K
     - "tell me about sachin tendulkar"
       Example Cypher (general info summary):
         MATCH (p:Person)
-        WHERE toLower(p.name) CONTAINS toLower($person)
-           OR toLower(coalesce(p.full_name, '')) CONTAINS toLower($person)
-           OR toLower(coalesce(p.nickname, '')) CONTAINS toLower($person)
+        WHERE ANY(x IN $persons_lc WHERE p.name_lc CONTAINS x
+           OR p.full_name_lc CONTAINS x
+           OR p.nickname_lc CONTAINS x)
         OPTIONAL MATCH (p)-[:BORN_IN]->(city:City)
         OPTIONAL MATCH (p)-[:FORMAT_STATS]->(s:Record {type:'Stats'})
         RETURN p.name AS name, p.full_name AS full_name, p.nickname AS nickname, p.batting_style AS batting_style,
@@ -100,6 +314,23 @@ class RuleBasedNLPMappings:
         LIMIT 1
     """
 
+    # One representative question per rule; used to pre-plan every Cypher template at startup.
+    EXAMPLE_QUESTIONS = (
+        "Who works at Contoso?",
+        "Where is Alice located?",
+        "List people in Contoso",
+        "What organizations is Alice affiliated with?",
+        "Who is the coach of Sachin Tendulkar?",
+        "Who is Alice?",
+        "What teams did Sachin Tendulkar play for?",
+        "What records does Sachin Tendulkar hold?",
+        "When did Sachin Tendulkar debut in Test cricket?",
+        "When did Sachin Tendulkar retire?",
+        "What are the career statistics of Sachin Tendulkar in ODI?",
+        "Where was Sachin Tendulkar born?",
+        "Tell me about Sachin Tendulkar",
+    )
+
     def _normalize_person_input(self, person: str) -> List[str]:
         """
         Normalize a user-supplied person name into a list of possible aliases to try.
@@ -108,55 +339,161 @@ class RuleBasedNLPMappings:
         - Stripped of periods (e.g., 'S. Tendulkar' -> 'S Tendulkar')
         - Simple initial expansion if it looks like 'X. Lastname' -> ['X Lastname', 'Sachin Tendulkar'] for demo
 
+        Known names are answered from _ALIAS_MAP; anything else goes through the heuristic.
         Note: This is a light heuristic. In production, alias expansion would come from the KG or an alias table.
         """
         p = (person or "").strip()
         if not p:
             return []
-        variants = {p, p.replace(".", "").strip()}
+        alias = _ALIAS_MAP.get(p.lower())
+        if alias:
+            return list(alias)
+
+        bare = p.translate(_STRIP_DOTS).strip()
+        variants = dict.fromkeys((p, bare))  # ordered de-duplication
 
         # Demo-focused: If looks like 'S Tendulkar' or 'S. Tendulkar', add 'Sachin Tendulkar'
-        tokens = p.replace(".", "").split()
+        tokens = bare.split()
         if len(tokens) == 2 and len(tokens[0]) == 1 and tokens[1].lower() == "tendulkar":
-            variants.add("Sachin Tendulkar")
+            variants[_SACHIN] = None
 
         return [v for v in variants if v]
 
-    def _person_where_clause(self, field: str = "p") -> str:
+    def _person_params(self, person: str, top_k: int) -> Dict:
         """
-        Build a reusable Cypher WHERE clause that matches Person by:
-        - case-insensitive exact name
-        - case-insensitive substring (CONTAINS)
-        - matching against common alias properties if present (full_name, nickname)
-
-        Usage: ... MATCH (p:Person) WHERE <clause> ...
-        It expects parameters:
-          $person OR $persons (list)
+        Build the lower-cased $persons_lc parameter for a user-supplied person name, expanding
+        aliases.
         """
-        # We support a single $person OR a list $persons; if list present we OR across them.
-        # Using coalesce toLower to avoid null issues for optional properties.
-        # Any of the properties matching is accepted.
-        # Use COALESCE to avoid unbound parameter errors if either is missing.
-        single_pred = (
-            "("
-            " toLower({f}.name) CONTAINS toLower(coalesce($person, '')) OR "
-            " toLower(coalesce({f}.full_name, '')) CONTAINS toLower(coalesce($person, '')) OR "
-            " toLower(coalesce({f}.nickname, '')) CONTAINS toLower(coalesce($person, '')) "
-            ")"
-        ).format(f=field)
-
-        list_pred = (
-            "("
-            " ANY(personParam IN coalesce($persons, []) WHERE "
-            "   toLower({f}.name) CONTAINS toLower(personParam) OR "
-            "   toLower(coalesce({f}.full_name, '')) CONTAINS toLower(personParam) OR "
-            "   toLower(coalesce({f}.nickname, '')) CONTAINS toLower(personParam)"
-            " )"
-            ")"
-        ).format(f=field)
-
-        # Include both; with COALESCE this is safe if one is absent.
-        return f"(({list_pred}) OR ({single_pred}))"
+        persons = list(dict.fromkeys(name.lower() for name in self._normalize_person_input(person))) or [person.lower()]
+        return {"persons_lc": persons, "top_k": top_k}
+
+    # -------------------------
+    # Generic demo rules (existing)
+    # -------------------------
+
+    def _map_works_at(self, org: str, top_k: int) -> CypherQuery:
+        # Pattern: who works at <organization>
+        return CypherQuery(
+            query=_CYPHER_WORKS_AT,
+            parameters={"org": org, "top_k": top_k},
+        )
+
+    def _map_located(self, person: str, top_k: int) -> CypherQuery:
+        # Pattern: where is <person> located
+        return CypherQuery(
+            query=_CYPHER_LOCATED,
+            parameters=self._person_params(person, top_k),
+        )
+
+    def _map_people_in(self, org: str, top_k: int) -> CypherQuery:
+        # Pattern: list people in <organization>
+        return CypherQuery(
+            query=_CYPHER_PEOPLE_IN,
+            parameters={"org": org, "top_k": top_k},
+        )
+
+    def _map_affiliated(self, person: str, top_k: int) -> CypherQuery:
+        # Pattern: what organizations is <person> affiliated with
+        return CypherQuery(
+            query=_CYPHER_AFFILIATED,
+            parameters=self._person_params(person, top_k),
+        )
+
+    def _map_coach(self, person: str, top_k: int) -> CypherQuery:
+        # Pattern: who is the coach of <person> / who coached <person>
+        return CypherQuery(
+            query=_CYPHER_COACH,
+            parameters=self._person_params(person, top_k),
+        )
+
+    def _map_who_is(self, person: str, top_k: int) -> CypherQuery:
+        # Fallback: try a basic generic person by name lookup
+        return CypherQuery(
+            query=_CYPHER_WHO_IS,
+            parameters=self._person_params(person, top_k),
+        )
+
+    # Handler per named group of _GENERIC_RULES_RE
+    _GENERIC_HANDLERS = {
+        "works_at": _map_works_at,
+        "located": _map_located,
+        "people_in": _map_people_in,
+        "affiliated": _map_affiliated,
+        "coach": _map_coach,
+        "who_is": _map_who_is,
+    }
+
+    # -------------------------
+    # Sachin Tendulkar specific rules
+    # -------------------------
+
+    def _map_teams(self, q: str, top_k: int) -> CypherQuery:
+        # What teams did Sachin Tendulkar play for?
+        return CypherQuery(
+            query=_CYPHER_TEAMS,
+            parameters={**_SACHIN_BASE, "top_k": top_k},
+        )
+
+    def _map_records(self, q: str, top_k: int) -> CypherQuery:
+        # What records does Sachin Tendulkar hold?
+        return CypherQuery(
+            query=_CYPHER_RECORDS,
+            parameters={**_SACHIN_BASE, "top_k": top_k},
+        )
+
+    def _map_debut(self, q: str, top_k: int) -> CypherQuery:
+        # When did Sachin Tendulkar debut in ODI/Test/International cricket? (no format = all formats)
+        return CypherQuery(
+            query=_CYPHER_DEBUT,
+            parameters={**_SACHIN_BASE, "format": _extract_format(q), "top_k": top_k},
+        )
+
+    def _map_retirement(self, q: str, top_k: int) -> CypherQuery:
+        # When did Sachin Tendulkar retire? (optional format filter)
+        return CypherQuery(
+            query=_CYPHER_RETIREMENT,
+            parameters={**_SACHIN_BASE, "format": _extract_format(q), "top_k": top_k},
+        )
+
+    def _map_stats(self, q: str, top_k: int) -> CypherQuery:
+        # What are the career statistics of Sachin Tendulkar in ODI/Test/International?
+        return CypherQuery(
+            query=_CYPHER_STATS,
+            parameters={**_SACHIN_BASE, "format": _extract_format(q), "top_k": top_k},
+        )
+
+    def _map_birthplace(self, q: str, top_k: int) -> CypherQuery:
+        # Where was Sachin Tendulkar born?
+        return CypherQuery(
+            query=_CYPHER_BIRTHPLACE,
+            parameters={**_SACHIN_BASE, "top_k": top_k},
+        )
+
+    def _map_about(self, q: str, top_k: int) -> CypherQuery:
+        # Tell me about Sachin Tendulkar (general info)
+        return CypherQuery(
+            query=_CYPHER_ABOUT,
+            parameters=_SACHIN_BASE.copy(),
+        )
+
+    # Handler per named group of _SACHIN_RULES_RE
+    _SACHIN_HANDLERS = {
+        "teams": _map_teams,
+        "records": _map_records,
+        "debut": _map_debut,
+        "retirement": _map_retirement,
+        "stats": _map_stats,
+        "birthplace": _map_birthplace,
+        "about": _map_about,
+    }
+
+    # Distinct (question, top_k) pairs memoized per instance.
+    MAPPING_CACHE_SIZE = 1024
+
+    def __init__(self):
+        # Memoized per instance rather than per module, so subclasses overriding _match_rules or a
+        # handler get their own results rather than those of the base rules.
+        self._map_normalized = lru_cache(maxsize=self.MAPPING_CACHE_SIZE)(self._map_frozen)
 
     def map_question(self, question: str, top_k: int = 10) -> Optional[CypherQuery]:
         """
@@ -172,266 +509,48 @@ class RuleBasedNLPMappings:
         if not question:
             return None
 
-        q = question.strip().lower()
-
-        # -------------------------
-        # Generic demo rules (existing)
-        # -------------------------
-
-        # Pattern: who works at <organization>
-        if q.startswith("who works at "):
-            org = q.replace("who works at ", "", 1).rstrip("?").strip()
-            if org:
-                return CypherQuery(
-                    query=(
-                        "MATCH (p:Person)-[:WORKS_AT]->(o:Organization {name: $org}) "
-                        "RETURN p.name AS person LIMIT $top_k"
-                    ),
-                    parameters={"org": org, "top_k": top_k},
-                )
-
-        # Pattern: where is <person> located
-        if q.startswith("where is ") and q.endswith(" located?"):
-            person = q[len("where is "):-len(" located?")].strip()
-            if person:
-                persons = self._normalize_person_input(person)
-                params = {"top_k": top_k}
-                if len(persons) > 1:
-                    params["persons"] = persons
-                else:
-                    params["person"] = persons[0] if persons else person
-                return CypherQuery(
-                    query=(
-                        "MATCH (p:Person)-[:LOCATED_IN]->(l:Location) "
-                        f"WHERE {self._person_where_clause('p')} "
-                        "RETURN l.name AS location LIMIT $top_k"
-                    ),
-                    parameters=params,
-                )
-
-        # Pattern: list people in <organization>
-        if q.startswith("list people in "):
-            org = q.replace("list people in ", "", 1).rstrip("?").strip()
-            if org:
-                return CypherQuery(
-                    query=(
-                        "MATCH (o:Organization {name: $org})<-[:WORKS_AT]-(p:Person) "
-                        "RETURN p.name AS person ORDER BY p.name LIMIT $top_k"
-                    ),
-                    parameters={"org": org, "top_k": top_k},
-                )
-
-        # Pattern: what organizations is <person> affiliated with
-        if q.startswith("what organizations is ") and q.endswith(" affiliated with?"):
-            person = q.replace("what organizations is ", "", 1).replace(" affiliated with?", "", 1).strip()
-            if person:
-                persons = self._normalize_person_input(person)
-                params = {"top_k": top_k}
-                if len(persons) > 1:
-                    params["persons"] = persons
-                else:
-                    params["person"] = persons[0] if persons else person
-                return CypherQuery(
-                    query=(
-                        "MATCH (p:Person)-[:WORKS_AT]->(o:Organization) "
-                        f"WHERE {self._person_where_clause('p')} "
-                        "RETURN o.name AS organization ORDER BY o.name LIMIT $top_k"
-                    ),
-                    parameters=params,
-                )
+        mapped = self._map_normalized(question.strip().lower(), top_k)
+        if mapped is None:
+            return None
+        query, params = mapped
+        return CypherQuery(
+            query=query,
+            parameters={key: list(value) if isinstance(value, tuple) else value for key, value in params},
+        )
 
-        # Pattern: who is the coach of <person> / who coached <person>
-        # Supports: "who is the coach of sachin tendulkar?", "who coached sachin tendulkar?"
-        # Also support shortform fragments: "coach of sachin tendulkar", "coach sachin tendulkar"
-        if (
-            q.startswith("who is the coach of ")
-            or q.startswith("who coached ")
-            or q.startswith("coach of ")
-            or q.startswith("coach ")
-        ):
-            # Extract the person by removing the leading pattern variants and optional trailing '?'
-            person = (
-                q.replace("who is the coach of ", "", 1)
-                 .replace("who coached ", "", 1)
-                 .replace("coach of ", "", 1)
-                 .replace("coach ", "", 1)
-                 .rstrip("?")
-                 .strip()
-            )
-            if person:
-                persons = self._normalize_person_input(person)
-                params = {"top_k": top_k}
-                if len(persons) > 1:
-                    params["persons"] = persons
-                else:
-                    params["person"] = persons[0] if persons else person
-                # We support both relationship directions for robustness:
-                # (coach)-[:COACHED]->(student) and (student)-[:COACHED_BY]->(coach)
-                return CypherQuery(
-                    query=(
-                        "MATCH (p:Person) "
-                        f"WHERE {self._person_where_clause('p')} "
-                        "OPTIONAL MATCH (c1:Person)-[:COACHED]->(p) "
-                        "OPTIONAL MATCH (p)-[:COACHED_BY]->(c2:Person) "
-                        "WITH p, coalesce(c1, c2) AS coach "
-                        "WHERE coach IS NOT NULL "
-                        "RETURN DISTINCT coach.name AS coach "
-                        "LIMIT $top_k"
-                    ),
-                    parameters=params,
-                )
+    def _map_frozen(self, q: str, top_k: int) -> Optional[Tuple[str, Tuple[Tuple[str, Any], ...]]]:
+        """
+        Rule matching for an already stripped and lower-cased question, memoized by __init__.
 
-        # Fallback: try a basic generic person by name lookup
-        if q.startswith("who is "):
-            person = q.replace("who is ", "", 1).rstrip("?").strip()
-            if person:
-                persons = self._normalize_person_input(person)
-                params = {"top_k": top_k}
-                if len(persons) > 1:
-                    params["persons"] = persons
-                else:
-                    params["person"] = persons[0] if persons else person
-                return CypherQuery(
-                    query=(
-                        "MATCH (p:Person) "
-                        f"WHERE {self._person_where_clause('p')} "
-                        "OPTIONAL MATCH (p)-[:WORKS_AT]->(o:Organization) "
-                        "OPTIONAL MATCH (p)-[:LOCATED_IN]->(l:Location) "
-                        "RETURN p.name AS person, o.name AS organization, l.name AS location "
-                        "LIMIT $top_k"
-                    ),
-                    parameters=params,
-                )
-
-        # -------------------------
-        # Sachin Tendulkar specific rules
-        # -------------------------
-
-        # Normalize helpful constants
-        SACHIN = "sachin tendulkar"
-
-        # 1) What teams did Sachin Tendulkar play for?
-        # Supports: "what teams did sachin tendulkar play for?" and close variants
-        if ("what teams did" in q and "sachin tendulkar" in q and "play for" in q) or \
-           q.strip() == "teams sachin tendulkar played for?":
-            return CypherQuery(
-                query=(
-                    "MATCH (p:Person)-[:PLAYED_FOR|:REPRESENTED|:CAPTAINED]->(t) "
-                    f"WHERE {self._person_where_clause('p')} "
-                    "RETURN DISTINCT t.name AS team "
-                    "ORDER BY team "
-                    "LIMIT $top_k"
-                ),
-                parameters={"person": "Sachin Tendulkar", "top_k": top_k},
-            )
-
-        # 2) What records does Sachin Tendulkar hold?
-        if ("what records does" in q and "sachin tendulkar" in q and "hold" in q) or \
-           q.strip() in {"sachin tendulkar records?", "records of sachin tendulkar?"}:
-            return CypherQuery(
-                query=(
-                    "MATCH (p:Person)-[:HOLDS_RECORD]->(r:Record) "
-                    f"WHERE {self._person_where_clause('p')} "
-                    "RETURN r.label AS record, r.value AS value, r.unit AS unit, r.year AS year "
-                    "ORDER BY record "
-                    "LIMIT $top_k"
-                ),
-                parameters={"person": "Sachin Tendulkar", "top_k": top_k},
-            )
-
-        # Helper to extract a cricket format keyword if present
-        def _extract_format(text: str) -> Optional[str]:
-            # Recognize common format names seeded in the graph
-            if "test" in text:
-                return "Test"
-            if "odi" in text:
-                return "ODI"
-            if "t20i" in text or "t20" in text:
-                return "T20I"
-            if "ipl" in text:
-                return "IPL"
-            if "international" in text:
-                # If user says "international", we don't have a direct "International" Stats node in seed,
-                # instead combine via multiple formats. For demo, return None to fetch all formats.
-                return None
+        Results are returned frozen, as (query, parameter items) with list values turned into
+        tuples; map_question expands them into a fresh parameters dict with fresh lists on every
+        call, so callers cannot mutate what is cached.
+        """
+        mapping = self._match_rules(q, top_k)
+        if mapping is None:
             return None
+        return mapping.query, tuple(
+            (key, tuple(value) if isinstance(value, list) else value) for key, value in mapping.parameters.items()
+        )
 
-        # 3) When did Sachin Tendulkar debut in ODI/Test/International cricket?
-        if ("when did" in q and "sachin tendulkar" in q and "debut" in q):
-            fmt = _extract_format(q)  # None means all formats
-            return CypherQuery(
-                query=(
-                    "MATCH (p:Person)-[:DEBUTED_IN]->(d:Record {type:'Debut'}) "
-                    f"WHERE {self._person_where_clause('p')} "
-                    "AND (($format IS NULL) OR toLower(d.format) = toLower($format)) "
-                    "RETURN d.format AS format, d.year AS year, d.opponent AS opponent, d.location AS location "
-                    "ORDER BY d.year ASC "
-                    "LIMIT $top_k"
-                ),
-                parameters={"person": "Sachin Tendulkar", "format": fmt, "top_k": top_k},
-            )
-
-        # 4) When did Sachin Tendulkar retire?
-        if ("when did" in q and "sachin tendulkar" in q and "retire" in q):
-            fmt = _extract_format(q)  # Optional format filter
-            return CypherQuery(
-                query=(
-                    "MATCH (p:Person)-[:RETIRED_IN]->(r:Record {type:'Retirement'}) "
-                    f"WHERE {self._person_where_clause('p')} "
-                    "AND (($format IS NULL) OR toLower(r.format) = toLower($format)) "
-                    "RETURN r.format AS format, r.year AS year, r.opponent AS opponent, r.location AS location "
-                    "ORDER BY r.year ASC "
-                    "LIMIT $top_k"
-                ),
-                parameters={"person": "Sachin Tendulkar", "format": fmt, "top_k": top_k},
-            )
-
-        # 5) What are the career statistics of Sachin Tendulkar in ODI/Test/International?
-        if (("what are the career statistics of" in q or "career statistics of" in q or "stats of" in q)
-                and "sachin tendulkar" in q):
-            fmt = _extract_format(q)
-            return CypherQuery(
-                query=(
-                    "MATCH (p:Person)-[:FORMAT_STATS]->(s:Record {type:'Stats'}) "
-                    f"WHERE {self._person_where_clause('p')} "
-                    "AND (($format IS NULL) OR toLower(s.format) = toLower($format)) "
-                    "RETURN s.format AS format, s.matches AS matches, s.runs AS runs, "
-                    "s.hundreds AS hundreds, s.fifties AS fifties, s.average AS average "
-                    "ORDER BY s.format "
-                    "LIMIT $top_k"
-                ),
-                parameters={"person": "Sachin Tendulkar", "format": fmt, "top_k": top_k},
-            )
-
-        # 6) Where was Sachin Tendulkar born?
-        if ("where was" in q and "sachin tendulkar" in q and "born" in q) or \
-           q.strip() in {"sachin tendulkar birthplace?", "birthplace of sachin tendulkar?"}:
-            return CypherQuery(
-                query=(
-                    "MATCH (p:Person)-[:BORN_IN]->(c:City) "
-                    f"WHERE {self._person_where_clause('p')} "
-                    "OPTIONAL MATCH (c)-[:IN_COUNTRY]->(country:Country) "
-                    "RETURN c.name AS city, country.name AS country "
-                    "LIMIT $top_k"
-                ),
-                parameters={"person": "Sachin Tendulkar", "top_k": top_k},
-            )
-
-        # 7) Tell me about Sachin Tendulkar (general info)
-        if q.startswith("tell me about ") and SACHIN in q or q.strip() in {"about sachin tendulkar", "who is sachin tendulkar"}:
-            return CypherQuery(
-                query=(
-                    "MATCH (p:Person) "
-                    f"WHERE {self._person_where_clause('p')} "
-                    "OPTIONAL MATCH (p)-[:BORN_IN]->(city:City) "
-                    "OPTIONAL MATCH (p)-[:FORMAT_STATS]->(s:Record {type:'Stats'}) "
-                    "RETURN p.name AS name, p.full_name AS full_name, p.nickname AS nickname, "
-                    "p.batting_style AS batting_style, p.bowling_style AS bowling_style, "
-                    "p.birth_year AS birth_year, city.name AS birth_city, "
-                    "collect({format:s.format, runs:s.runs, matches:s.matches, hundreds:s.hundreds, fifties:s.fifties, average:s.average}) AS formats "
-                    "LIMIT 1"
-                ),
-                parameters={"person": "Sachin Tendulkar"},
-            )
+    def _match_rules(self, q: str, top_k: int) -> Optional[CypherQuery]:
+        """
+        Run the rules against a normalized question.
+        """
+        # Generic rules: a single anchored match; the named group that matched selects the handler.
+        m = _GENERIC_RULES_RE.match(q)
+        if m:
+            entity = m.group(m.lastgroup).strip()
+            if entity:
+                return self._GENERIC_HANDLERS[m.lastgroup](self, entity, top_k)
+
+        # Sachin Tendulkar specific rules: one match, alternatives tried in rule order. Every
+        # alternative names him, so questions that don't skip the lazy scans entirely.
+        if _SACHIN_LC not in q:
+            return None
+        m = _SACHIN_RULES_RE.match(q)
+        if m:
+            return self._SACHIN_HANDLERS[m.lastgroup](self, q, top_k)
 
         return None
+
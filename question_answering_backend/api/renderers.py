@@ -0,0 +1,29 @@
+from collections.abc import Mapping
+
+import orjson
+from rest_framework.renderers import BaseRenderer
+
+
+def orjson_default(obj):
+    """
+    orjson fallback for types it does not encode natively.
+    """
+    # Read-only mappings (e.g. the shared theme metadata) are not natively supported by orjson.
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError
+
+
+# PUBLIC_INTERFACE
+class ORJSONRenderer(BaseRenderer):
+    """
+    JSON response renderer backed by orjson; a faster drop-in for DRF's JSONRenderer.
+    """
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return orjson.dumps(data, default=orjson_default)
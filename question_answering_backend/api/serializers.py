@@ -1,6 +1,11 @@
 from typing import Any, Dict
 from rest_framework import serializers
 
+# Request limits, shared with the ask view's fast-path validation.
+QUESTION_MAX_LENGTH = 500
+TOP_K_MAX = 100
+TOP_K_DEFAULT = 10
+
 
 # PUBLIC_INTERFACE
 class AskRequestSerializer(serializers.Serializer):
@@ -11,14 +16,14 @@ class AskRequestSerializer(serializers.Serializer):
         help_text="A natural language question to query the knowledge graph.",
         allow_blank=False,
         trim_whitespace=True,
-        max_length=500,
+        max_length=QUESTION_MAX_LENGTH,
     )
     top_k = serializers.IntegerField(
         help_text="Optional limit on number of results.",
         required=False,
         min_value=1,
-        max_value=100,
-        default=10,
+        max_value=TOP_K_MAX,
+        default=TOP_K_DEFAULT,
     )
 
 
@@ -45,3 +50,31 @@ class AskResponseSerializer(serializers.Serializer):
             "results": payload.get("results", []) or [],
             "meta": payload.get("meta", {}) or {},
         }
+
+
+# PUBLIC_INTERFACE
+class AskBatchRequestSerializer(serializers.Serializer):
+    """
+    Serializer for asking several questions in one request.
+    """
+    questions = serializers.ListField(
+        child=serializers.CharField(allow_blank=False, trim_whitespace=True, max_length=QUESTION_MAX_LENGTH),
+        help_text="Natural language questions to query the knowledge graph.",
+        min_length=1,
+        max_length=20,
+    )
+    top_k = serializers.IntegerField(
+        help_text="Optional limit on number of results per question.",
+        required=False,
+        min_value=1,
+        max_value=TOP_K_MAX,
+        default=TOP_K_DEFAULT,
+    )
+
+
+# PUBLIC_INTERFACE
+class AskBatchResponseSerializer(serializers.Serializer):
+    """
+    Serializer for batch answers: one answer per question, in request order.
+    """
+    answers = AskResponseSerializer(many=True)
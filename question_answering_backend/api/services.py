@@ -1,10 +1,102 @@
 """
 Application services that orchestrate NLP mapping and Neo4j querying.
 """
-from typing import Any, Dict, List
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Dict, Hashable, List, Optional, Tuple
 
-from .nlp_mapping import RuleBasedNLPMappings
-from .neo4j_service import neo4j_service
+from .nlp_mapping import CypherQuery, RuleBasedNLPMappings
+from .neo4j_service import env_number, neo4j_service
+
+# Constant response metadata, shared read-only by every response.
+_META_THEME = MappingProxyType({
+    "name": "Ocean Professional",
+    "primary": "#2563EB",
+    "secondary": "#F59E0B",
+    "success": "#F59E0B",
+    "error": "#EF4444",
+})
+_SUPPORTED_EXAMPLES = (
+    "Who works at Contoso?",
+    "Where is Alice located?",
+    "List people in Contoso",
+    "What organizations is Alice affiliated with?",
+    "Who is Alice?",
+)
+# The meta block is the same for every answer of a kind, so each payload shares one read-only copy.
+_ANSWERED_META = MappingProxyType({"theme": _META_THEME})
+_UNMAPPED_META = MappingProxyType({
+    "note": "No mapping found. Try a supported pattern like 'Who works at OrgName?'",
+    "supported_examples": _SUPPORTED_EXAMPLES,
+})
+
+
+def _freeze(value: Any) -> Hashable:
+    """
+    Turn a parameters value (dicts and lists of scalars) into a hashable cache key part.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class _ResultCache:
+    """
+    Small thread-safe LRU cache whose entries expire after ttl seconds.
+
+    Keys include neo4j_service.write_version, so writes made through this process
+    (run_write_tx) invalidate everything at once; writes from other processes, such as
+    the seed_graph command, are bounded by the TTL.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Hashable, rows: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, rows)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
 
 
 class QuestionAnswerService:
@@ -18,6 +110,87 @@ class QuestionAnswerService:
 
     def __init__(self) -> None:
         self._mapper = RuleBasedNLPMappings()
+        # Identical Cypher + parameters within QA_RESULT_CACHE_TTL seconds skip the database; 0 disables.
+        self._results = _ResultCache(maxsize=512, ttl=env_number("QA_RESULT_CACHE_TTL", 60.0))
+        # Async queries currently running, by cache key; identical concurrent questions await the same task.
+        self._inflight: Dict[Hashable, "asyncio.Task[List[Dict[str, Any]]]"] = {}
+
+    def _cache_key(self, query: str, parameters: Dict[str, Any]) -> Hashable:
+        return (neo4j_service.write_version, query, _freeze(parameters))
+
+    def _run_cached(self, query: str, parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Run a read query through the result cache. Cached rows are shared between callers
+        and must be treated as read-only.
+        """
+        if self._results.ttl <= 0:
+            return neo4j_service.run_cypher(query, parameters)
+        key = self._cache_key(query, parameters)
+        rows = self._results.get(key)
+        if rows is None:
+            rows = neo4j_service.run_cypher(query, parameters)
+            self._results.set(key, rows)
+        return rows
+
+    async def _arun_cached(self, query: str, parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Coroutine counterpart of _run_cached, backed by the asyncio Neo4j driver.
+
+        Concurrent calls for the same statement share one in-flight query (single flight), so a
+        burst of identical questions costs one round-trip even before the first answer is cached.
+        """
+        key = self._cache_key(query, parameters)
+        if self._results.ttl > 0:
+            rows = self._results.get(key)
+            if rows is not None:
+                return rows
+
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(key)
+        if task is None or task.get_loop() is not loop:
+            task = loop.create_task(neo4j_service.run_cypher_async(query, parameters))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget_inflight(key, done))
+
+        # shield: a cancelled caller (e.g. client disconnect) must not cancel the query for the others.
+        rows = await asyncio.shield(task)
+        if self._results.ttl > 0:
+            self._results.set(key, rows)
+        return rows
+
+    def _forget_inflight(self, key: Hashable, task: "asyncio.Task[List[Dict[str, Any]]]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark as retrieved when every awaiting caller has gone away
+
+    @staticmethod
+    def _unmapped(question: str) -> Dict[str, Any]:
+        return {
+            "question": question,
+            "cypher": "",
+            "parameters": {},
+            "results": [],
+            "meta": _UNMAPPED_META,
+        }
+
+    @staticmethod
+    def _answered(question: str, mapping: CypherQuery, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "question": question,
+            "cypher": mapping.query,
+            "parameters": mapping.parameters,
+            "results": rows,
+            "meta": _ANSWERED_META,
+        }
+
+    # PUBLIC_INTERFACE
+    def has_mapping(self, question: str, top_k: int = 10) -> bool:
+        """
+        Whether the question maps to a Cypher template, i.e. whether answering it may query Neo4j.
+        Mapping is memoized, so checking before ask() costs a cache lookup.
+        """
+        return self._mapper.map_question(question, top_k=top_k) is not None
 
     # PUBLIC_INTERFACE
     def ask(self, question: str, top_k: int = 10) -> Dict[str, Any]:
@@ -29,39 +202,113 @@ class QuestionAnswerService:
         """
         mapping = self._mapper.map_question(question, top_k=top_k)
         if not mapping:
-            return {
-                "question": question,
-                "cypher": "",
-                "parameters": {},
-                "results": [],
-                "meta": {
-                    "note": "No mapping found. Try a supported pattern like 'Who works at OrgName?'",
-                    "supported_examples": [
-                        "Who works at Contoso?",
-                        "Where is Alice located?",
-                        "List people in Contoso",
-                        "What organizations is Alice affiliated with?",
-                        "Who is Alice?"
-                    ],
-                },
-            }
+            return self._unmapped(question)
 
-        rows: List[Dict[str, Any]] = neo4j_service.run_cypher(mapping.query, mapping.parameters)
-        return {
-            "question": question,
-            "cypher": mapping.query,
-            "parameters": mapping.parameters,
-            "results": rows,
-            "meta": {
-                "theme": {
-                    "name": "Ocean Professional",
-                    "primary": "#2563EB",
-                    "secondary": "#F59E0B",
-                    "success": "#F59E0B",
-                    "error": "#EF4444",
-                }
-            },
-        }
+        rows = self._run_cached(mapping.query, mapping.parameters)
+        return self._answered(question, mapping, rows)
+
+    # PUBLIC_INTERFACE
+    async def aask(self, question: str, top_k: int = 10) -> Dict[str, Any]:
+        """
+        Async counterpart of ask for ASGI callers: the Neo4j round-trip is awaited on the event
+        loop instead of blocking a worker thread, so concurrent questions overlap their I/O.
+
+        Returns:
+            Dict containing: question, cypher, parameters, results, meta
+        """
+        mapping = self._mapper.map_question(question, top_k=top_k)
+        if not mapping:
+            return self._unmapped(question)
+
+        rows = await self._arun_cached(mapping.query, mapping.parameters)
+        return self._answered(question, mapping, rows)
+
+    # PUBLIC_INTERFACE
+    async def aask_stream(
+        self, question: str, top_k: int = 10
+    ) -> Tuple[Dict[str, Any], Optional[AsyncIterator[Dict[str, Any]]]]:
+        """
+        Like aask, but rows are not materialized: returns the payload with empty results plus an
+        async iterator over rows streamed from Neo4j (None when the question is unmapped).
+        Streamed answers bypass the result cache.
+        """
+        mapping = self._mapper.map_question(question, top_k=top_k)
+        if not mapping:
+            return self._unmapped(question), None
+
+        rows = await neo4j_service.stream_cypher_async(mapping.query, mapping.parameters)
+        return self._answered(question, mapping, []), rows
+
+    # PUBLIC_INTERFACE
+    def ask_batch(self, questions: List[str], top_k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Answer several questions at once. Questions are mapped first; statements that are not
+        in the result cache (de-duplicated) then run together in a single Neo4j read transaction.
+
+        Returns:
+            One ask() payload per question, in the same order.
+        """
+        mappings = [self._mapper.map_question(question, top_k=top_k) for question in questions]
+        # Keys are computed once: they include write_version, which a concurrent write may bump.
+        keys = [self._cache_key(m.query, m.parameters) if m else None for m in mappings]
+
+        rows_by_key: Dict[Hashable, List[Dict[str, Any]]] = {}
+        pending: Dict[Hashable, CypherQuery] = {}
+        for mapping, key in zip(mappings, keys):
+            if not mapping:
+                continue
+            if key in rows_by_key or key in pending:
+                continue
+            cached = self._results.get(key) if self._results.ttl > 0 else None
+            if cached is None:
+                pending[key] = mapping
+            else:
+                rows_by_key[key] = cached
+
+        if pending:
+            results = neo4j_service.run_cypher_batch([(m.query, m.parameters) for m in pending.values()])
+            for key, rows in zip(pending, results):
+                rows_by_key[key] = rows
+                if self._results.ttl > 0:
+                    self._results.set(key, rows)
+
+        payloads = []
+        for question, mapping, key in zip(questions, mappings, keys):
+            if not mapping:
+                payloads.append(self._unmapped(question))
+            else:
+                payloads.append(self._answered(question, mapping, rows_by_key[key]))
+        return payloads
+
+    # PUBLIC_INTERFACE
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Size, limits and hit/miss counters of the result cache.
+        """
+        return self._results.stats()
+
+    # PUBLIC_INTERFACE
+    def clear_cache(self) -> None:
+        """
+        Drop every cached result and reset the counters, e.g. after loading data out of process.
+        """
+        self._results.clear()
+
+    # PUBLIC_INTERFACE
+    def warm_up(self) -> int:
+        """
+        Pre-run the Cypher template behind every supported rule so the first real question
+        is served from Neo4j's plan cache.
+
+        Returns:
+            Number of templates that ran successfully.
+        """
+        statements = []
+        for question in self._mapper.EXAMPLE_QUESTIONS:
+            mapping = self._mapper.map_question(question)
+            if mapping:
+                statements.append((mapping.query, mapping.parameters))
+        return neo4j_service.warm_up(statements)
 
 
 qa_service = QuestionAnswerService()
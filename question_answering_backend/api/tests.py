@@ -1,9 +1,418 @@
-from rest_framework.test import APITestCase
+import asyncio
+import json
+import re
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
 from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from .apps import start_background_tasks
+from .neo4j_service import _Neo4jService, env_number, neo4j_service
+from .nlp_mapping import CypherQuery, RuleBasedNLPMappings, _extract_format
+from .services import QuestionAnswerService, _ResultCache, qa_service
+from .views import _Neo4jSlots, _stream_payload
+
 
 class HealthTests(APITestCase):
     def test_health(self):
         url = reverse('Health')  # Make sure the URL is named
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.data, {"message": "Server is up!"})
+        self.assertEqual(response.json(), {"message": "Server is up!"})
+
+
+class AskETagTests(APITestCase):
+    def post_ask(self, **headers):
+        return self.client.post(reverse('AskQuestion'), {"question": "What is the weather?"}, format='json', **headers)
+
+    def test_if_none_match(self):
+        etag = self.post_ask()["ETag"]
+        for header, status_code in [
+            (etag, 412),
+            ('W/' + etag, 412),
+            ('"other", ' + etag, 412),
+            ('*', 412),
+            ('"other"', 200),
+        ]:
+            response = self.post_ask(HTTP_IF_NONE_MATCH=header)
+            self.assertEqual(response.status_code, status_code, header)
+            self.assertEqual(bool(response.content), status_code == 200, header)
+            self.assertEqual(response["ETag"], etag, header)
+
+
+class AskValidationTests(APITestCase):
+    def post_ask(self, body):
+        return self.client.post(reverse('AskQuestion'), body, format='json')
+
+    def test_bool_top_k_is_rejected(self):
+        response = self.post_ask({"question": "What is the weather?", "top_k": True})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("top_k", response.json())
+
+    def test_numeric_string_top_k_falls_back_to_serializer(self):
+        response = self.post_ask({"question": "What is the weather?", "top_k": "5"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["question"], "What is the weather?")
+
+    def test_whitespace_question_is_rejected(self):
+        response = self.post_ask({"question": "   "})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("question", response.json())
+
+    def test_missing_question_matches_serializer_error(self):
+        response = self.post_ask({"top_k": 5})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.content, b'{"question":["This field is required."]}')
+
+
+class AskBatchTests(APITestCase):
+    def test_unmapped_questions_are_answered_in_order(self):
+        questions = ["What is the weather?", "Tell me a joke"]
+        response = self.client.post(reverse('AskQuestionBatch'), {"questions": questions}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([answer["question"] for answer in response.data["answers"]], questions)
+        self.assertTrue(all(answer["cypher"] == "" for answer in response.data["answers"]))
+
+    def test_mapped_questions_share_one_batch_in_order(self):
+        questions = ["Who works at Contoso?", "Where is Alice located?", "who works at contoso?", "Tell me a joke"]
+
+        def run_cypher_batch(statements):
+            # A write lands mid-batch; the answers must still line up with their questions.
+            neo4j_service.write_version += 1
+            return [[{"org": parameters.get("org")}] for _, parameters in statements]
+
+        service = QuestionAnswerService()
+        with mock.patch('api.services.neo4j_service.run_cypher_batch', side_effect=run_cypher_batch) as batch, \
+                mock.patch('api.services.neo4j_service.write_version', 0):
+            answers = service.ask_batch(questions)
+        batch.assert_called_once()
+        self.assertEqual(len(batch.call_args.args[0]), 2)
+        self.assertEqual([answer["question"] for answer in answers], questions)
+        self.assertEqual([answer["results"] for answer in answers],
+                         [[{"org": "contoso"}], [{"org": None}], [{"org": "contoso"}], []])
+
+    def test_empty_batch_is_rejected(self):
+        response = self.client.post(reverse('AskQuestionBatch'), {"questions": []}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class AskStreamTests(TestCase):
+    def stub_rows(self, closed):
+        async def stream_cypher_async(query, parameters=None):
+            async def rows():
+                try:
+                    for name in ("Alice", "Bob"):
+                        yield {"person": name}
+                finally:
+                    closed.append(True)
+            return rows()
+        return mock.patch('api.services.neo4j_service.stream_cypher_async', stream_cypher_async)
+
+    async def test_streamed_mapped_answer_carries_the_rows(self):
+        closed = []
+        with self.stub_rows(closed):
+            response = await self.async_client.post(
+                reverse('AskQuestion') + '?stream=1', {"question": "Who works at Contoso?"},
+                content_type='application/json'
+            )
+            body = json.loads(b"".join([chunk async for chunk in response.streaming_content]))
+        self.assertEqual(body["results"], [{"person": "Alice"}, {"person": "Bob"}])
+        self.assertIn("WORKS_AT", body["cypher"])
+        self.assertEqual(closed, [True])
+
+    async def test_abandoned_stream_closes_the_rows(self):
+        closed = []
+        with self.stub_rows(closed):
+            payload, rows = await qa_service.aask_stream("Who works at Contoso?")
+            stream = _stream_payload(payload, rows)
+            await stream.__anext__()
+            await stream.__anext__()
+            await stream.aclose()
+        self.assertEqual(closed, [True])
+
+    async def test_streamed_unmapped_answer_is_one_json_document(self):
+        response = await self.async_client.post(
+            reverse('AskQuestion') + '?stream=1', {"question": "What is the weather?"}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        body = json.loads(b"".join([chunk async for chunk in response.streaming_content]))
+        self.assertEqual((body["cypher"], body["results"]), ("", []))
+        self.assertIn("supported_examples", body["meta"])
+
+    async def test_only_unstreamed_answers_are_gzipped(self):
+        # Large enough that gzip always wins despite the random padding added against BREACH.
+        rows = [{"person": f"Person {n}"} for n in range(100)]
+        with mock.patch('api.services.neo4j_service.run_cypher', return_value=rows), self.stub_rows([]):
+            for query, encoding in (('', 'gzip'), ('?stream=1', None)):
+                response = await self.async_client.post(
+                    reverse('AskQuestion') + query, {"question": "Who works at Gzip Corp?"},
+                    content_type='application/json', headers={'Accept-Encoding': 'gzip'}
+                )
+                self.assertEqual(response.status_code, 200, query)
+                self.assertEqual(response.get('Content-Encoding'), encoding, query)
+
+
+class BackpressureTests(APITestCase):
+    def test_mapped_questions_are_refused_when_neo4j_slots_are_taken(self):
+        slots = _Neo4jSlots(size=1)
+        slots.acquire()
+        with mock.patch('api.views._neo4j_slots', slots):
+            refused = self.client.post(reverse('AskQuestion'), {"question": "Who works at Contoso?"}, format='json')
+            unmapped = self.client.post(reverse('AskQuestion'), {"question": "What is the weather?"}, format='json')
+        self.assertEqual(refused.status_code, 503)
+        self.assertEqual(refused["Retry-After"], "1")
+        self.assertEqual(unmapped.status_code, 200)
+        self.assertEqual(slots.stats(), {"size": 1, "rejected": 1})
+
+
+class CacheTests(APITestCase):
+    def test_clear_requires_staff(self):
+        self.assertEqual(self.client.post(reverse('CacheClear')).status_code, 403)
+        self.client.force_authenticate(User.objects.create_user("viewer"))
+        self.assertEqual(self.client.post(reverse('CacheClear')).status_code, 403)
+
+    def test_clear_resets_stats(self):
+        self.client.force_authenticate(User.objects.create_user("admin", is_staff=True))
+        self.assertEqual(self.client.post(reverse('CacheClear')).status_code, 200)
+        response = self.client.get(reverse('CacheStats'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data["size"], response.data["hits"], response.data["misses"]), (0, 0, 0))
+
+
+class ResultCacheTests(SimpleTestCase):
+    def test_hit_after_set(self):
+        cache = _ResultCache(maxsize=2, ttl=60)
+        self.assertIsNone(cache.get("a"))
+        cache.set("a", [{"n": 1}])
+        self.assertEqual(cache.get("a"), [{"n": 1}])
+        self.assertEqual((cache.stats()["hits"], cache.stats()["misses"]), (1, 1))
+
+    def test_entries_expire_after_ttl(self):
+        cache = _ResultCache(maxsize=2, ttl=60)
+        with mock.patch("api.services.time.monotonic", return_value=1000.0):
+            cache.set("a", [])
+        with mock.patch("api.services.time.monotonic", return_value=1059.0):
+            self.assertEqual(cache.get("a"), [])
+        with mock.patch("api.services.time.monotonic", return_value=1060.0):
+            self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["size"], 0)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = _ResultCache(maxsize=2, ttl=60)
+        cache.set("a", [])
+        cache.set("b", [])
+        cache.get("a")
+        cache.set("c", [])
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c")), ([], []))
+
+    def test_writes_invalidate_cached_rows(self):
+        service = QuestionAnswerService()
+        with mock.patch("api.services.neo4j_service.run_cypher", side_effect=[[{"n": 1}], [{"n": 2}]]) as run_cypher, \
+                mock.patch("api.services.neo4j_service.write_version", 0):
+            self.assertEqual(service._run_cached("RETURN 1 AS n", {}), [{"n": 1}])
+            self.assertEqual(service._run_cached("RETURN 1 AS n", {}), [{"n": 1}])
+            neo4j_service.write_version += 1
+            self.assertEqual(service._run_cached("RETURN 1 AS n", {}), [{"n": 2}])
+        self.assertEqual(run_cypher.call_count, 2)
+
+    def test_malformed_settings_fall_back_to_defaults(self):
+        env = {
+            "QA_RESULT_CACHE_TTL": "1m",
+            "NEO4J_URI": "bolt://localhost:7687",
+            "NEO4J_HEALTH_INTERVAL": "five",
+            "NEO4J_WARMUP": "false",
+        }
+        with mock.patch.dict("os.environ", env), self.assertLogs("api.neo4j_service", "WARNING"), \
+                mock.patch("api.neo4j_service.neo4j_service.start_health_monitor") as start_health_monitor:
+            self.assertEqual(QuestionAnswerService()._results.ttl, 60.0)
+            start_background_tasks()
+        start_health_monitor.assert_called_once_with(5.0)
+
+    def test_env_number(self):
+        for raw, expected in [("", 7), (" 12 ", 12)]:
+            with mock.patch.dict("os.environ", {"QA_TEST_SETTING": raw}):
+                self.assertEqual(env_number("QA_TEST_SETTING", 7, int), expected, raw)
+        for raw, cast in [("1.5", int), ("nan", float), ("inf", float)]:
+            with mock.patch.dict("os.environ", {"QA_TEST_SETTING": raw}), \
+                    self.assertLogs("api.neo4j_service", "WARNING"):
+                self.assertEqual(env_number("QA_TEST_SETTING", 7, cast), 7, raw)
+
+
+class SingleFlightTests(SimpleTestCase):
+    question = "Who works at Contoso?"
+
+    def stub_query(self, calls, release, fail=()):
+        """
+        Patch run_cypher_async with a query that waits for release; the calls numbered in fail raise.
+        """
+        async def run_cypher_async(query, parameters=None):
+            calls.append(query)
+            await release.wait()
+            if len(calls) in fail:
+                raise ValueError("Neo4j query failed: boom")
+            return [{"person": "Alice"}]
+        return mock.patch('api.services.neo4j_service.run_cypher_async', run_cypher_async)
+
+    async def test_concurrent_identical_questions_share_one_query(self):
+        service, calls, release = QuestionAnswerService(), [], asyncio.Event()
+        with self.stub_query(calls, release):
+            answers = asyncio.gather(*(service.aask(self.question) for _ in range(3)))
+            await asyncio.sleep(0)
+            release.set()
+            answers = await answers
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([answer["results"] for answer in answers], [[{"person": "Alice"}]] * 3)
+        self.assertEqual(service._inflight, {})
+
+    async def test_cancelled_caller_does_not_cancel_the_shared_query(self):
+        service, calls, release = QuestionAnswerService(), [], asyncio.Event()
+        with self.stub_query(calls, release):
+            first = asyncio.ensure_future(service.aask(self.question))
+            second = asyncio.ensure_future(service.aask(self.question))
+            await asyncio.sleep(0)
+            first.cancel()
+            release.set()
+            answer = await second
+            with self.assertRaises(asyncio.CancelledError):
+                await first
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(answer["results"], [{"person": "Alice"}])
+
+    async def test_failed_query_is_retried_by_the_next_caller(self):
+        service, calls, release = QuestionAnswerService(), [], asyncio.Event()
+        release.set()
+        with self.stub_query(calls, release, fail=(1,)):
+            with self.assertRaises(ValueError):
+                await service.aask(self.question)
+            self.assertEqual(service._inflight, {})
+            answer = await service.aask(self.question)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(answer["results"], [{"person": "Alice"}])
+
+
+class Neo4jServiceTests(SimpleTestCase):
+    async def test_async_queries_use_the_sync_driver_outside_asgi(self):
+        service = _Neo4jService()
+        with mock.patch.object(service, "run_cypher", return_value=[{"ok": 1}]) as run_cypher, \
+                mock.patch("api.neo4j_service.AsyncGraphDatabase") as async_graph_database:
+            rows = await service.run_cypher_async("RETURN 1 AS ok")
+        self.assertEqual(rows, [{"ok": 1}])
+        run_cypher.assert_called_once_with("RETURN 1 AS ok", None)
+        async_graph_database.driver.assert_not_called()
+
+    def test_pool_size_is_read_without_creating_the_driver(self):
+        service = _Neo4jService()
+        with mock.patch.object(service, "_ensure_driver") as ensure_driver:
+            for raw, expected in [("", 50), ("8", 8), ("0", 50)]:
+                with mock.patch.dict("os.environ", {"NEO4J_MAX_CONNECTION_POOL_SIZE": raw}):
+                    self.assertEqual(service.max_connection_pool_size, expected, raw)
+        ensure_driver.assert_not_called()
+
+    def test_concurrent_first_use_builds_one_driver(self):
+        service = _Neo4jService()
+        env = {"NEO4J_URI": "bolt://localhost:7687", "NEO4J_USER": "neo4j", "NEO4J_PASSWORD": "secret"}
+        barrier = threading.Barrier(4)
+
+        def ensure_driver():
+            barrier.wait()
+            service._ensure_driver()
+
+        def slow_driver(**kwargs):
+            time.sleep(0.05)
+            return mock.Mock()
+
+        with mock.patch.dict("os.environ", env), mock.patch("api.neo4j_service.socket.getaddrinfo"), \
+                mock.patch("api.neo4j_service.GraphDatabase.driver", side_effect=slow_driver) as driver:
+            threads = [threading.Thread(target=ensure_driver) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        driver.assert_called_once()
+        self.assertIsNone(service._config_err)
+
+
+class NLPMappingTests(SimpleTestCase):
+    def test_extract_format(self):
+        for text, expected in [
+            ("when did sachin tendulkar debut in test cricket?", "Test"),
+            ("career statistics in odis", "ODI"),
+            ("debut in t20 cricket", "T20I"),
+            ("debut in t20i cricket", "T20I"),
+            ("stats in the ipl", "IPL"),
+            ("debut in international cricket", None),
+            ("his latest periodic stats", None),
+            ("odi and test", "Test"),
+            ("ipl or t20", "T20I"),
+        ]:
+            self.assertEqual(_extract_format(text), expected, text)
+
+    def test_example_questions_map_to_distinct_templates(self):
+        mapper = RuleBasedNLPMappings()
+        queries = []
+        for question in mapper.EXAMPLE_QUESTIONS:
+            mapping = mapper.map_question(question)
+            self.assertIsNotNone(mapping, question)
+            queries.append(mapping.query)
+        self.assertEqual(len(set(queries)), len(queries))
+
+    def test_templates_use_exactly_the_supplied_parameters(self):
+        mapper = RuleBasedNLPMappings()
+        for question in mapper.EXAMPLE_QUESTIONS:
+            mapping = mapper.map_question(question)
+            self.assertEqual(set(re.findall(r"\$(\w+)", mapping.query)), set(mapping.parameters), question)
+
+    def test_mapping_parameters_are_not_shared_between_calls(self):
+        mapper = RuleBasedNLPMappings()
+        first = mapper.map_question("Who works at Contoso?", top_k=3)
+        first.parameters["org"] = "mutated"
+        second = mapper.map_question("  who works at contoso?", top_k=3)
+        self.assertEqual(second.parameters, {"org": "contoso", "top_k": 3})
+
+        first = mapper.map_question("Who is Alice?", top_k=3)
+        first.parameters["persons_lc"].append("mallory")
+        second = mapper.map_question("who is alice?", top_k=3)
+        self.assertEqual(second.parameters["persons_lc"], ["alice"])
+
+    def test_subclass_rules_are_not_bypassed_by_the_cache(self):
+        class PingMappings(RuleBasedNLPMappings):
+            def _match_rules(self, q, top_k):
+                if q == "ping":
+                    return CypherQuery("RETURN 1", {})
+                return super()._match_rules(q, top_k)
+
+        self.assertIsNone(RuleBasedNLPMappings().map_question("ping"))
+        self.assertEqual(PingMappings().map_question("Ping").query, "RETURN 1")
+        self.assertIn("WORKS_AT", PingMappings().map_question("Who works at Contoso?").query)
+
+    def test_generic_rules_need_an_entity(self):
+        mapper = RuleBasedNLPMappings()
+        for question in ["who works at ??", "who is ???", "list people in ?", "coach of ?",
+                         "where is ? located?", "where is alice located", "where is alice located??",
+                         "what organizations is alice affiliated with"]:
+            self.assertIsNone(mapper.map_question(question), question)
+        self.assertEqual(mapper.map_question("who works at acme ?").parameters["org"], "acme")
+        self.assertEqual(mapper.map_question("Where is Alice located?").parameters["persons_lc"], ["alice"])
+
+    def test_sachin_rules_match_phrases_in_any_order(self):
+        mapper = RuleBasedNLPMappings()
+        for canonical, reordered in [
+            ("What teams did Sachin Tendulkar play for?", "Sachin Tendulkar: what teams did he play for?"),
+            ("What records does Sachin Tendulkar hold?", "Sachin Tendulkar - what records does he hold?"),
+            ("When did Sachin Tendulkar debut?", "Sachin Tendulkar, when did he debut?"),
+            ("When did Sachin Tendulkar retire?", "Sachin Tendulkar... when did he retire?"),
+            ("Where was Sachin Tendulkar born?", "Sachin Tendulkar, where was he born?"),
+        ]:
+            mapping = mapper.map_question(reordered)
+            self.assertIsNotNone(mapping, reordered)
+            self.assertEqual(mapping.query, mapper.map_question(canonical).query, reordered)
+
+    def test_tell_me_about_requires_a_known_person(self):
+        mapper = RuleBasedNLPMappings()
+        self.assertIsNone(mapper.map_question("Tell me about Bob"))
+        self.assertIsNotNone(mapper.map_question("About Sachin Tendulkar?"))
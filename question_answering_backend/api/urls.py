@@ -1,8 +1,11 @@
 from django.urls import path
-from .views import health, ask, neo4j_health
+from .views import health, ask, ask_batch, cache_clear, cache_stats, neo4j_health
 
 urlpatterns = [
     path('health/', health, name='Health'),
     path('health/neo4j/', neo4j_health, name='Neo4jHealth'),
     path('ask/', ask, name='AskQuestion'),
+    path('ask/batch/', ask_batch, name='AskQuestionBatch'),
+    path('cache/stats/', cache_stats, name='CacheStats'),
+    path('cache/clear/', cache_clear, name='CacheClear'),
 ]
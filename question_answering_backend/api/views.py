@@ -1,22 +1,202 @@
-from rest_framework.decorators import api_view
+import hashlib
+import logging
+import threading
+import time
+
+import orjson
+from asgiref.sync import sync_to_async
+from adrf.decorators import api_view as async_api_view
+from django.http import HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import parse_etags, quote_etag
+from django.views.decorators.http import require_safe
+from rest_framework.decorators import api_view, parser_classes, permission_classes, renderer_classes
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from rest_framework import status
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
-from .serializers import AskRequestSerializer, AskResponseSerializer
+from .parsers import ORJSONParser
+from .renderers import ORJSONRenderer, orjson_default
+from .serializers import (
+    AskBatchRequestSerializer,
+    AskBatchResponseSerializer,
+    AskRequestSerializer,
+    AskResponseSerializer,
+    QUESTION_MAX_LENGTH,
+    TOP_K_DEFAULT,
+    TOP_K_MAX,
+)
 from .services import qa_service
 from .neo4j_service import neo4j_service
 
+# Probes within this many seconds reuse the last Neo4j health result (success or failure), so burst
+# checks from load balancers or dashboards don't each hit the database.
+_NEO4J_HEALTH_TTL = 5.0
+_HEALTH_BODY = b'{"message":"Server is up!"}'
+_neo4j_health_last = (0.0, None, None)  # (expires_at, payload, status)
 
-@api_view(['GET'])
+# With the background health monitor running, results older than this are reported as failures:
+# the probe thread is stuck behind an unresponsive Neo4j.
+_NEO4J_HEALTH_MAX_AGE = 15.0
+
+# Blocking service calls run on the loop's default executor rather than Django's single
+# thread-sensitive thread, so concurrent requests overlap. The batch path always uses the sync
+# driver; ask does too unless the ASGI entrypoint enabled the asyncio driver.
+_ask_batch_in_thread = sync_to_async(qa_service.ask_batch, thread_sensitive=False)
+_ask_in_thread = sync_to_async(qa_service.ask, thread_sensitive=False)
+
+logger = logging.getLogger(__name__)
+
+
+class _Neo4jSlots:
+    """
+    Cap on question requests querying Neo4j at once in this process, sized to the driver's
+    connection pool. Beyond it a request would only wait for a connection (up to
+    NEO4J_CONNECTION_ACQUISITION_TIMEOUT) while holding its memory, so it is refused straight away.
+
+    A thread semaphore, not an asyncio one: it is shared by every event loop (one per request
+    under WSGI) and by ask_batch's worker threads. Refusals are counted for neo4j_health.
+    """
+
+    def __init__(self, size: int) -> None:
+        self._lock = threading.Lock()
+        self._semaphore = threading.BoundedSemaphore(size)
+        self.size = size
+        self.rejected = 0
+
+    def acquire(self) -> bool:
+        """
+        Take a slot without waiting; False (and one more refusal counted) when none is free.
+        """
+        if self._semaphore.acquire(blocking=False):
+            return True
+        with self._lock:
+            self.rejected += 1
+        return False
+
+    def release(self) -> None:
+        self._semaphore.release()
+
+    def stats(self):
+        return {"size": self.size, "rejected": self.rejected}
+
+
+# Sized from the environment at import, so no request builds the driver on the event loop for it.
+_neo4j_slots = _Neo4jSlots(neo4j_service.max_connection_pool_size)
+
+
+def _json_response(request, payload) -> HttpResponse:
+    """
+    Encode a payload of JSON-native types with orjson, bypassing DRF's renderer on hot paths.
+
+    The response carries an ETag derived from the body. When the request's If-None-Match names
+    it (weak comparison) or is "*", the precondition fails and no body is sent: 304 for GET and
+    HEAD, 412 for any other method (RFC 9110, section 13.1.2).
+    """
+    body = orjson.dumps(payload, default=orjson_default)
+    etag = quote_etag(hashlib.blake2b(body, digest_size=16).hexdigest())
+    known = [tag[2:] if tag.startswith("W/") else tag for tag in parse_etags(request.headers.get("If-None-Match", ""))]
+    if etag in known or "*" in known:
+        if request.method in ("GET", "HEAD"):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(status=status.HTTP_412_PRECONDITION_FAILED)
+    else:
+        response = HttpResponse(body, content_type="application/json")
+    response["ETag"] = etag
+    return response
+
+
+# Pre-encoded 400 body for the most common malformed ask request, identical to the serializer's errors.
+_ERR_MISSING_QUESTION = orjson.dumps({"question": ["This field is required."]})
+
+
+def _fast_ask_args(data):
+    """
+    Validate the common {"question": str, "top_k": int} body without running the serializer.
+
+    Returns (question, top_k) when the body is plainly valid, or None to defer to
+    AskRequestSerializer, which also accepts less common shapes (e.g. numeric strings for top_k)
+    and produces the error messages.
+    """
+    if not isinstance(data, dict):
+        return None
+    question = data.get("question")
+    top_k = data.get("top_k", TOP_K_DEFAULT)
+    if type(question) is not str or type(top_k) is not int:
+        return None
+    question = question.strip()
+    if not question or len(question) > QUESTION_MAX_LENGTH or "\x00" in question or not 1 <= top_k <= TOP_K_MAX:
+        return None
+    return question, top_k
+
+
+def _is_missing_question_only(data):
+    """
+    True when the body lacks "question" and has nothing else the serializer would reject, i.e.
+    when its errors would be exactly _ERR_MISSING_QUESTION.
+    """
+    if not isinstance(data, dict) or "question" in data:
+        return False
+    top_k = data.get("top_k", TOP_K_DEFAULT)
+    return type(top_k) is int and 1 <= top_k <= TOP_K_MAX
+
+
+def _busy_response(view_name) -> Response:
+    """
+    503 for a request refused because every Neo4j slot is taken. Refusals are counted in the
+    "slots" block of /api/health/neo4j/ and logged as warnings; a growing count is the sign to
+    raise NEO4J_MAX_CONNECTION_POOL_SIZE.
+    """
+    logger.warning("%s rejected: all %d Neo4j slots are busy", view_name, _neo4j_slots.size)
+    return Response(
+        {"detail": "Server busy, retry shortly."},
+        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": "1"},
+    )
+
+
+async def _stream_payload(payload, rows, slot_held=False):
+    """
+    Yield an ask payload as JSON, writing each row into "results" as it arrives from Neo4j.
+    Headers are already sent when rows fail mid-stream, so such errors close the document
+    with an "error" field instead of "meta".
+
+    The rows iterator is closed when the stream ends, fails or is abandoned (e.g. the client
+    went away), which closes its Neo4j session right away rather than whenever it is collected.
+    With slot_held, the request's Neo4j slot is released at the same point, as the rows keep a
+    pooled connection busy until then.
+    """
+    try:
+        head = {key: payload[key] for key in ("question", "cypher", "parameters")}
+        yield orjson.dumps(head, default=orjson_default)[:-1] + b',"results":['
+        if rows is not None:
+            separator = b""
+            try:
+                async for row in rows:
+                    yield separator + orjson.dumps(row, default=orjson_default)
+                    separator = b","
+            except ValueError as exc:
+                yield b'],"error":' + orjson.dumps(str(exc)) + b"}"
+                return
+            finally:
+                await rows.aclose()
+        yield b'],"meta":' + orjson.dumps(payload["meta"], default=orjson_default) + b"}"
+    finally:
+        if slot_held:
+            _neo4j_slots.release()
+
+
+@require_safe
 def health(request):
     """
     Health check endpoint.
 
-    Returns 200 and a simple JSON message.
+    Returns 200 and a simple JSON message. A plain Django view (GET/HEAD only) with a constant
+    body: load balancers poll it often, and DRF's negotiation and rendering add nothing here.
     """
-    return Response({"message": "Server is up!"})
+    return HttpResponse(_HEALTH_BODY, content_type="application/json")
 
 
 # PUBLIC_INTERFACE
@@ -36,21 +216,48 @@ def health(request):
     },
     tags=["Question Answering"],
 )
-@api_view(['GET'])
-def neo4j_health(request):
+@async_api_view(['GET'])
+async def neo4j_health(request):
     """
-    Perform a minimal connectivity check against Neo4j using a trivial Cypher query.
+    Report Neo4j connectivity, checked with a trivial Cypher query.
+
+    When the background health monitor runs (ASGI, see start_background_tasks), its latest probe is returned
+    without touching Neo4j; a probe older than _NEO4J_HEALTH_MAX_AGE seconds counts as a failure.
+    Otherwise the query runs here through run_cypher_async (the asyncio driver under ASGI, a
+    worker thread under WSGI; see ask), and its result is reused for _NEO4J_HEALTH_TTL seconds.
+
+    Every query borrows a connection from the driver pool (NEO4J_MAX_CONNECTION_POOL_SIZE, default 50).
+    When all are busy, queries wait up to NEO4J_CONNECTION_ACQUISITION_TIMEOUT seconds (default 30)
+    and then fail; 500s here or from /ask after such waits point at pool exhaustion.
 
     Returns:
         200 with {"ok": true, "details": "..."} if the check succeeds,
         500 with {"ok": false, "error": "<message>"} if it fails.
+        Both carry "slots": {"size": ..., "rejected": ...}, the per-process cap on questions
+        querying Neo4j at once (null until first used) and how many requests it refused with 503.
     """
-    try:
-        rows = neo4j_service.run_cypher("RETURN 1 AS ok")
-        ok = bool(rows and rows[0].get("ok") == 1)
-        return Response({"ok": ok, "details": "Neo4j reachable."}, status=status.HTTP_200_OK)
-    except ValueError as exc:
-        return Response({"ok": False, "error": str(exc)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    global _neo4j_health_last
+    monitored = neo4j_service.last_health()
+    if monitored is not None:
+        checked_at, ok, error = monitored
+        age = time.monotonic() - checked_at
+        if age >= _NEO4J_HEALTH_MAX_AGE:
+            error = "Neo4j health probe is stale (last completed %.0f seconds ago)." % age
+        if error is None:
+            payload, status_code = {"ok": ok, "details": "Neo4j reachable."}, status.HTTP_200_OK
+        else:
+            payload, status_code = {"ok": False, "error": error}, status.HTTP_500_INTERNAL_SERVER_ERROR
+    else:
+        expires_at, payload, status_code = _neo4j_health_last
+        if expires_at <= time.monotonic():
+            try:
+                rows = await neo4j_service.run_cypher_async("RETURN 1 AS ok")
+                ok = bool(rows and rows[0].get("ok") == 1)
+                payload, status_code = {"ok": ok, "details": "Neo4j reachable."}, status.HTTP_200_OK
+            except ValueError as exc:
+                payload, status_code = {"ok": False, "error": str(exc)}, status.HTTP_500_INTERNAL_SERVER_ERROR
+            _neo4j_health_last = (time.monotonic() + _NEO4J_HEALTH_TTL, payload, status_code)
+    return Response({**payload, "slots": _neo4j_slots.stats()}, status=status_code)
 
 
 # PUBLIC_INTERFACE
@@ -65,28 +272,53 @@ def neo4j_health(request):
         "- Who works at Contoso?\n"
         "- Where is Alice located?\n"
         "- List people in Contoso\n"
-        "- What organizations is Alice affiliated with?\n"
+        "- What organizations is Alice affiliated with?\n\n"
+        "Add ?stream=1 to stream result rows as they arrive (chunked transfer; requires ASGI).\n\n"
+        "Non-streamed answers carry an ETag; send it back in If-None-Match to get a bodiless 412 "
+        "(Precondition Failed) instead of the body while the answer is unchanged."
     ),
+    manual_parameters=[
+        openapi.Parameter(
+            'stream', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, enum=[0, 1], required=False,
+            description="1 to stream results instead of returning them in one body.",
+        ),
+    ],
     request_body=AskRequestSerializer,
     responses={
         200: openapi.Response(
             description="Answer payload with results, the generated Cypher query, and parameters.",
             schema=AskResponseSerializer
         ),
+        412: "Answer unchanged since the ETag given in If-None-Match (no body)",
         400: "Invalid request",
         500: "Server error",
+        503: "Too many questions in flight; retry after Retry-After seconds",
     },
     tags=["Question Answering"],
 )
-@api_view(['POST'])
-def ask(request):
+@async_api_view(['POST'])
+@parser_classes([ORJSONParser])
+@renderer_classes([ORJSONRenderer])
+async def ask(request):
     """
-    Ask endpoint.
+    Ask endpoint. Async: under ASGI (uvicorn, see config.asgi) the Neo4j round-trip is awaited on
+    the event loop, so one worker serves many in-flight questions instead of blocking a thread
+    per request. Served through WSGI (runserver), the sync ask runs in a worker thread.
 
     Parameters (JSON body):
     - question: string. Natural language question.
     - top_k: integer (optional). Max number of results, default 10.
 
+    Query parameters:
+    - stream: "1" to stream result rows as they arrive (requires ASGI).
+
+    Headers:
+    - If-None-Match: ETag of a previous answer; 412 without a body if it is unchanged.
+
+    Responds 503 with Retry-After when as many questions as the Neo4j pool has connections are
+    already querying Neo4j. Unmapped questions never query it and are always answered; streamed
+    answers hold their slot until the stream ends.
+
     Returns:
     - question: The original question
     - cypher: The generated Cypher query (or empty if unmapped)
@@ -94,17 +326,145 @@ def ask(request):
     - results: List of result rows (dictionaries)
     - meta: Additional metadata and theme tokens
     """
-    serializer = AskRequestSerializer(data=request.data)
+    args = _fast_ask_args(request.data)
+    if args is None:
+        if _is_missing_question_only(request.data):
+            return HttpResponse(_ERR_MISSING_QUESTION, status=status.HTTP_400_BAD_REQUEST,
+                                content_type="application/json")
+        serializer = AskRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        args = serializer.validated_data["question"], serializer.validated_data["top_k"]
+    question, top_k = args
+
+    slot_held = qa_service.has_mapping(question, top_k)
+    if slot_held and not _neo4j_slots.acquire():
+        return _busy_response("ask")
+    try:
+        if request.query_params.get("stream") == "1":
+            service_payload, rows = await qa_service.aask_stream(question=question, top_k=top_k)
+            response = StreamingHttpResponse(
+                _stream_payload(AskResponseSerializer.from_payload(service_payload), rows, slot_held),
+                content_type="application/json",
+            )
+            slot_held = False  # released by _stream_payload when the stream ends
+            return response
+        if neo4j_service.async_driver_enabled:
+            service_payload = await qa_service.aask(question=question, top_k=top_k)
+        else:
+            service_payload = await _ask_in_thread(question=question, top_k=top_k)
+        return _json_response(request, AskResponseSerializer.from_payload(service_payload))
+    except ValueError as exc:
+        return Response(
+            {"detail": str(exc)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    finally:
+        if slot_held:
+            _neo4j_slots.release()
+
+
+# PUBLIC_INTERFACE
+@swagger_auto_schema(
+    method='post',
+    operation_id='ask_questions_batch',
+    operation_summary='Ask Questions (Batch)',
+    operation_description=(
+        "Submit up to 20 natural-language questions at once. All mapped questions are answered "
+        "from a single Neo4j read transaction; answers come back in request order, each shaped "
+        "like the /ask response."
+    ),
+    request_body=AskBatchRequestSerializer,
+    responses={
+        200: openapi.Response(
+            description="One answer payload per question.",
+            schema=AskBatchResponseSerializer
+        ),
+        400: "Invalid request",
+        500: "Server error",
+        503: "Too many questions in flight; retry after Retry-After seconds",
+    },
+    tags=["Question Answering"],
+)
+@async_api_view(['POST'])
+@parser_classes([ORJSONParser])
+@renderer_classes([ORJSONRenderer])
+async def ask_batch(request):
+    """
+    Batch ask endpoint.
+
+    Parameters (JSON body):
+    - questions: list of strings (1-20). Natural language questions.
+    - top_k: integer (optional). Max number of results per question, default 10.
+
+    Returns:
+    - answers: List of ask payloads (question, cypher, parameters, results, meta), in request order
+    """
+    serializer = AskBatchRequestSerializer(data=request.data)
     if not serializer.is_valid():
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     data = serializer.validated_data
+    top_k = data.get("top_k", 10)
+    slot_held = any(qa_service.has_mapping(question, top_k) for question in data["questions"])
+    if slot_held and not _neo4j_slots.acquire():
+        return _busy_response("ask_batch")
     try:
-        service_payload = qa_service.ask(question=data["question"], top_k=data.get("top_k", 10))
-        response_payload = AskResponseSerializer.from_payload(service_payload)
-        return Response(response_payload, status=status.HTTP_200_OK)
+        service_payloads = await _ask_batch_in_thread(questions=data["questions"], top_k=top_k)
+        answers = [AskResponseSerializer.from_payload(payload) for payload in service_payloads]
+        return Response({"answers": answers}, status=status.HTTP_200_OK)
     except ValueError as exc:
         return Response(
             {"detail": str(exc)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
+    finally:
+        if slot_held:
+            _neo4j_slots.release()
+
+
+# PUBLIC_INTERFACE
+@swagger_auto_schema(
+    method='get',
+    operation_id='cache_stats',
+    operation_summary='Result Cache Stats',
+    operation_description=(
+        "Size, limits (maxsize, ttl in seconds) and hit/miss counters of the in-process result cache "
+        "behind /ask. Each worker process has its own cache."
+    ),
+    responses={200: openapi.Response(description="Cache statistics")},
+    tags=["Cache"],
+)
+@api_view(['GET'])
+def cache_stats(request):
+    """
+    Report result cache statistics for this process.
+    """
+    return Response(qa_service.cache_stats(), status=status.HTTP_200_OK)
+
+
+# PUBLIC_INTERFACE
+@swagger_auto_schema(
+    method='post',
+    operation_id='cache_clear',
+    operation_summary='Clear Result Cache',
+    operation_description=(
+        "Drop every cached /ask result in this process, e.g. after re-seeding the graph from another "
+        "process (the seed_graph command). Staff users only (Django admin accounts, via session or "
+        "basic auth)."
+    ),
+    responses={
+        200: openapi.Response(description="Cache cleared"),
+        403: "Not a staff user",
+    },
+    tags=["Cache"],
+)
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def cache_clear(request):
+    """
+    Clear the result cache for this process. Staff only: anyone else could turn every /ask
+    into a cache miss.
+    """
+    qa_service.clear_cache()
+    return Response({"cleared": True}, status=status.HTTP_200_OK)
@@ -11,6 +11,13 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from api.apps import start_background_tasks
+from api.neo4j_service import neo4j_service
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_asgi_application()
+
+# A single long-lived event loop serves every request, so async views can keep one asyncio driver.
+neo4j_service.enable_async_driver()
+start_background_tasks()
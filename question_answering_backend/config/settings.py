@@ -65,6 +65,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    # Compresses JSON answers for clients sending Accept-Encoding: gzip (bodies under 200 bytes and
+    # streamed answers are left alone). Above everything that reads or writes the response body.
+    'api.middleware.NonStreamingGZipMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',